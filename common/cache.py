@@ -0,0 +1,86 @@
+import copy
+import threading
+from collections import OrderedDict
+
+import requests
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class CachingSession(requests.Session):
+    """requests.Session с кэшем GET-ответов по ETag (If-None-Match) и LRU-вытеснением."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != "GET":
+            response = super().request(method, url, *args, **kwargs)
+            if response.status_code < 400:
+                self.invalidate(url)
+            return response
+
+        # ключ - полный URL с параметрами: ?$select=... и ?$expand=... - разные ответы одного ресурса
+        params = args[0] if args else kwargs.get("params")
+        key = requests.Request(method, url, params=params).prepare().url
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers["If-None-Match"] = entry.headers["ETag"]
+            kwargs["headers"] = headers
+
+        response = super().request(method, url, *args, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self.hits += 1
+            cached = copy.copy(entry)
+            cached.elapsed = response.elapsed
+            cached.from_cache = True
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200 and "ETag" in response.headers:
+            self._store(key, response)
+        return response
+
+    def _store(self, url, response):
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(url)
+            self._entries[url] = response
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, url):
+        response = self._entries.pop(url, None)
+        if response is not None:
+            self.size -= len(response.content)
+
+    def invalidate(self, url):
+        # POST на .../Actions/ComputerSystem.Reset меняет сам ресурс, его дочерние ресурсы и коллекцию-родителя
+        resource = url.split("?")[0].split("/Actions/")[0].rstrip("/")
+        parent = resource.rsplit("/", 1)[0]
+        with self._lock:
+            for key in list(self._entries):
+                path = key.split("?")[0].rstrip("/")
+                if path in (resource, parent) or path.startswith(resource + "/"):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
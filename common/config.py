@@ -0,0 +1,15 @@
+import os
+
+# Параметры подключения к BMC; по умолчанию - QEMU romulus из scripts/start_qemu.sh
+BMC_URL = os.environ.get("BMC_URL", "https://localhost:2443").rstrip("/")
+BASE_URL = f"{BMC_URL}/redfish/v1"
+# Парк BMC: адреса через запятую (scripts/start_fleet.sh пишет их в /tmp/qemu-fleet.env); по умолчанию - один BMC_URL
+BMC_URLS = [url.strip().rstrip("/") for url in os.environ.get("BMC_URLS", BMC_URL).split(",") if url.strip()]
+USERNAME = os.environ.get("BMC_USERNAME", "root")
+PASSWORD = os.environ.get("BMC_PASSWORD", "0penBmc")
+TIMEOUT = 30
+
+
+def bmc_id(url):
+    # "https://localhost:2444" -> "localhost:2444": имя BMC в id тестов, отчетах и группах xdist
+    return url.split("://", 1)[-1].rstrip("/")
@@ -0,0 +1,89 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.config import TIMEOUT
+
+SERVICE_ROOT = "/redfish/v1"
+
+
+@dataclass
+class RedfishResource:
+    path: str
+    status_code: int = None
+    data: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    error: str = None
+
+
+def normalize_link(link):
+    # "/redfish/v1/Chassis/chassis/Thermal#/Temperatures/0" -> "/redfish/v1/Chassis/chassis/Thermal"
+    path = urlsplit(link).path.rstrip("/")
+    if path == SERVICE_ROOT or path.startswith(SERVICE_ROOT + "/"):
+        return path
+    return None
+
+
+def iter_links(data):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == "@odata.id" and isinstance(value, str):
+                yield value
+            else:
+                yield from iter_links(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_links(item)
+
+
+class RedfishCrawler:
+    """Обходит дерево Redfish по ссылкам @odata.id с ограниченным параллелизмом."""
+
+    def __init__(self, session, host, concurrency=16, timeout=TIMEOUT, exclude=()):
+        self.session = session
+        self.host = host.rstrip("/")
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.exclude = tuple(exclude)
+        # пул соединений по умолчанию - 10, иначе лишние потоки ждут свободное соединение
+        adapter = session.get_adapter(self.host)
+        if isinstance(adapter, HTTPAdapter) and adapter._pool_maxsize < self.concurrency:
+            adapter.init_poolmanager(adapter._pool_connections, self.concurrency, adapter._pool_block)
+
+    def _allowed(self, path):
+        return not any(path.startswith(prefix) for prefix in self.exclude)
+
+    def _fetch(self, path):
+        resource = RedfishResource(path=path)
+        started = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.host}{path}", timeout=self.timeout)
+            resource.status_code = response.status_code
+            if response.status_code == 200:
+                resource.data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            resource.error = str(e)
+        resource.elapsed = time.perf_counter() - started
+        return resource
+
+    def crawl(self, start=SERVICE_ROOT):
+        start = normalize_link(start)
+        inventory = {}
+        seen = {start}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = {pool.submit(self._fetch, start)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    resource = future.result()
+                    inventory[resource.path] = resource
+                    for link in iter_links(resource.data):
+                        path = normalize_link(link)
+                        if path and path not in seen and self._allowed(path):
+                            seen.add(path)
+                            pending.add(pool.submit(self._fetch, path))
+        return dict(sorted(inventory.items()))
@@ -0,0 +1,575 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import secrets
+import ssl
+import time
+from email.utils import formatdate
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+SERVICE_ROOT = "/redfish/v1"
+
+RESET_TYPES = ["On", "ForceOff", "GracefulShutdown", "GracefulRestart", "ForceRestart", "ForceOn", "PowerCycle"]
+
+def timestamp():
+    """Текущее время в формате Redfish DateTime с миллисекундами: две перезагрузки за секунду различимы."""
+    now = time.time()
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{int(now * 1000) % 1000:03d}+00:00"
+
+
+# свойства, которые bmcweb разрешает менять через PATCH: путь -> {свойство: (тип, допустимый диапазон)}
+WRITABLE = {
+    f"{SERVICE_ROOT}/Systems/system": {"AssetTag": (str, None), "LocationIndicatorActive": (bool, None)},
+    f"{SERVICE_ROOT}/SessionService": {"SessionTimeout": (int, (30, 86400))},
+}
+
+
+def parse_latency(spec):
+    """Строка вида fixed:0.2, uniform:0.1:0.5, normal:0.3:0.05, lognormal:-1.5:0.4 или exp:0.2 -> функция задержки в секундах."""
+    if not spec:
+        return lambda: 0.0
+    name, *args = spec.split(":")
+    args = [float(arg) for arg in args]
+    distributions = {
+        "fixed": lambda: args[0],
+        "uniform": lambda: random.uniform(args[0], args[1]),
+        "normal": lambda: max(0.0, random.gauss(args[0], args[1])),
+        "lognormal": lambda: random.lognormvariate(args[0], args[1]),
+        "exp": lambda: random.expovariate(1.0 / args[0]),
+    }
+    if name not in distributions:
+        raise ValueError(f"Неизвестное распределение задержки: {spec}")
+    return distributions[name]
+
+
+def redfish_error(code, message):
+    return {"error": {"code": f"Base.1.13.0.{code}", "message": message}}
+
+
+def link(path):
+    return {"@odata.id": path}
+
+
+def collection(path, odata_type, name, members):
+    return {
+        "@odata.id": path,
+        "@odata.type": odata_type,
+        "Name": name,
+        "Members": [link(member) for member in members],
+        "Members@odata.count": len(members),
+    }
+
+
+class RedfishEmulator:
+    """Эмулятор подмножества Redfish OpenBMC на asyncio для быстрой отладки тестов и нагрузки."""
+
+    def __init__(self, username="root", password="0penBmc", latency=None, error_rate=0.0,
+                 max_sessions=64, off_delay=2.0, on_delay=5.0, sensor_period=1.0, expand=True):
+        self.username = username
+        self.password = password
+        self.latency = latency or parse_latency(None)
+        self.error_rate = error_rate
+        self.max_sessions = max_sessions
+        self.off_delay = off_delay
+        self.on_delay = on_delay
+        self.sensor_period = sensor_period
+        self.expand = expand
+        self.sessions = {}
+        self.resources = {}
+        self.requests_served = 0
+        # сериализованные ответы: path -> (body, etag); сбрасываются при изменении ресурса
+        self._encoded = {}
+        self._power_task = None
+        self._sse_queues = set()
+        self._sse_id = 0
+        self._build_tree()
+
+    def _build_tree(self):
+        base = SERVICE_ROOT
+        self.resources = {
+            base: {
+                "@odata.id": base,
+                "@odata.type": "#ServiceRoot.v1_15_0.ServiceRoot",
+                "Id": "RootService",
+                "Name": "Root Service",
+                "RedfishVersion": "1.17.0",
+                "SessionService": link(f"{base}/SessionService"),
+                "Systems": link(f"{base}/Systems"),
+                "Chassis": link(f"{base}/Chassis"),
+                "EventService": link(f"{base}/EventService"),
+                "Links": {"Sessions": link(f"{base}/SessionService/Sessions")},
+                "ProtocolFeaturesSupported": {
+                    "ExpandQuery": {"ExpandAll": self.expand, "Levels": self.expand, "MaxLevels": 6,
+                                    "Links": self.expand, "NoLinks": self.expand},
+                    "SelectQuery": self.expand,
+                },
+            },
+            f"{base}/SessionService": {
+                "@odata.id": f"{base}/SessionService",
+                "@odata.type": "#SessionService.v1_1_8.SessionService",
+                "Id": "SessionService",
+                "Name": "Session Service",
+                "ServiceEnabled": True,
+                "SessionTimeout": 3600,
+                "Sessions": link(f"{base}/SessionService/Sessions"),
+            },
+            f"{base}/EventService": {
+                "@odata.id": f"{base}/EventService",
+                "@odata.type": "#EventService.v1_7_2.EventService",
+                "Id": "EventService",
+                "Name": "Event Service",
+                "ServiceEnabled": True,
+                "ServerSentEventUri": f"{base}/EventService/SSE",
+                "EventFormatTypes": ["Event", "MetricReport"],
+            },
+            f"{base}/Systems": collection(f"{base}/Systems", "#ComputerSystemCollection.ComputerSystemCollection",
+                                          "Computer System Collection", [f"{base}/Systems/system"]),
+            f"{base}/Systems/system": {
+                "@odata.id": f"{base}/Systems/system",
+                "@odata.type": "#ComputerSystem.v1_16_0.ComputerSystem",
+                "Id": "system",
+                "Name": "system",
+                "SystemType": "Physical",
+                "AssetTag": "",
+                "LocationIndicatorActive": False,
+                "PowerState": "On",
+                "LastResetTime": timestamp(),
+                "Status": {"Health": "OK", "State": "Enabled"},
+                "Links": {"Chassis": [link(f"{base}/Chassis/chassis")]},
+                "Actions": {
+                    "#ComputerSystem.Reset": {
+                        "target": f"{base}/Systems/system/Actions/ComputerSystem.Reset",
+                        "ResetType@Redfish.AllowableValues": RESET_TYPES,
+                    }
+                },
+            },
+            f"{base}/Chassis": collection(f"{base}/Chassis", "#ChassisCollection.ChassisCollection",
+                                          "Chassis Collection", [f"{base}/Chassis/chassis"]),
+            f"{base}/Chassis/chassis": {
+                "@odata.id": f"{base}/Chassis/chassis",
+                "@odata.type": "#Chassis.v1_22_0.Chassis",
+                "Id": "chassis",
+                "Name": "chassis",
+                "ChassisType": "RackMount",
+                "PowerState": "On",
+                "Status": {"Health": "OK", "State": "Enabled"},
+                "Thermal": link(f"{base}/Chassis/chassis/Thermal"),
+                "ThermalSubSystem": link(f"{base}/Chassis/chassis/ThermalSubSystem"),
+                "Sensors": link(f"{base}/Chassis/chassis/Sensors"),
+            },
+            f"{base}/Chassis/chassis/Thermal": {
+                "@odata.id": f"{base}/Chassis/chassis/Thermal",
+                "@odata.type": "#Thermal.v1_7_0.Thermal",
+                "Id": "Thermal",
+                "Name": "Thermal",
+                "Temperatures": [self._temperature(f"{base}/Chassis/chassis/Thermal", i, name)
+                                 for i, name in enumerate(["cpu0", "cpu1", "ambient"])],
+                "Fans": [
+                    {
+                        "@odata.id": f"{base}/Chassis/chassis/Thermal#/Fans/{i}",
+                        "MemberId": f"fan{i}",
+                        "Name": f"fan{i}",
+                        "Reading": 7000,
+                        "ReadingUnits": "RPM",
+                        "Status": {"Health": "OK", "State": "Enabled"},
+                    }
+                    for i in range(4)
+                ],
+            },
+            f"{base}/Chassis/chassis/ThermalSubSystem": {
+                "@odata.id": f"{base}/Chassis/chassis/ThermalSubSystem",
+                "@odata.type": "#ThermalSubsystem.v1_0_0.ThermalSubsystem",
+                "Id": "ThermalSubsystem",
+                "Name": "Thermal Subsystem",
+                "Status": {"Health": "OK", "State": "Enabled"},
+                "ThermalMetrics": link(f"{base}/Chassis/chassis/ThermalSubSystem/ThermalMetrics"),
+            },
+            f"{base}/Chassis/chassis/ThermalSubSystem/ThermalMetrics": {
+                "@odata.id": f"{base}/Chassis/chassis/ThermalSubSystem/ThermalMetrics",
+                "@odata.type": "#ThermalMetrics.v1_0_0.ThermalMetrics",
+                "Id": "ThermalMetrics",
+                "Name": "Chassis Thermal Metrics",
+                "TemperatureReadingsCelsius": [],
+            },
+        }
+        sensors = f"{base}/Chassis/chassis/Sensors"
+        for sensor in self.resources[f"{base}/Chassis/chassis/Thermal"]["Temperatures"]:
+            self._add_sensor(f"temperature_{sensor['Name']}", "Temperature", "Cel", sensor["ReadingCelsius"])
+        for fan in self.resources[f"{base}/Chassis/chassis/Thermal"]["Fans"]:
+            self._add_sensor(f"fan_tach_{fan['Name']}", "Rotational", "RPM", fan["Reading"])
+        self.resources[sensors] = collection(sensors, "#SensorCollection.SensorCollection", "Sensors",
+                                             [path for path in self.resources if path.startswith(sensors + "/")])
+        self._sync_sensors()
+        self._refresh_sessions()
+
+    def _add_sensor(self, sensor_id, reading_type, units, reading):
+        path = f"{SERVICE_ROOT}/Chassis/chassis/Sensors/{sensor_id}"
+        self.resources[path] = {
+            "@odata.id": path,
+            "@odata.type": "#Sensor.v1_2_0.Sensor",
+            "Id": sensor_id,
+            "Name": sensor_id,
+            "ReadingType": reading_type,
+            "ReadingUnits": units,
+            "Reading": reading,
+            "Status": {"Health": "OK", "State": "Enabled"},
+        }
+        if reading_type == "Temperature":
+            self.resources[path]["Thresholds"] = {
+                "UpperCritical": {"Reading": 90.0},
+                "UpperFatal": {"Reading": 100.0},
+            }
+
+    def _temperature(self, thermal, index, name):
+        return {
+            "@odata.id": f"{thermal}#/Temperatures/{index}",
+            "MemberId": name,
+            "Name": name,
+            "ReadingCelsius": 40.0,
+            "UpperThresholdCritical": 90.0,
+            "UpperThresholdFatal": 100.0,
+            "Status": {"Health": "OK", "State": "Enabled"},
+        }
+
+    def _refresh_sessions(self):
+        path = f"{SERVICE_ROOT}/SessionService/Sessions"
+        self.resources[path] = collection(path, "#SessionCollection.SessionCollection", "Session Collection",
+                                          [f"{path}/{session_id}" for session_id in self.sessions])
+        self._changed(path)
+
+    def _changed(self, path):
+        self._encoded.pop(path, None)
+
+    def _encode(self, path):
+        if path not in self._encoded:
+            body = json.dumps(self.resources[path]).encode()
+            self._encoded[path] = (body, '"%s"' % hashlib.md5(body).hexdigest()[:16])
+        return self._encoded[path]
+
+    def set_power_state(self, state):
+        for path in (f"{SERVICE_ROOT}/Systems/system", f"{SERVICE_ROOT}/Chassis/chassis"):
+            self.resources[path]["PowerState"] = state
+            self._changed(path)
+        self._publish({
+            "@odata.type": "#Event.v1_7_0.Event",
+            "Id": str(self._sse_id + 1),
+            "Name": "Event Log",
+            "Events": [{
+                "EventType": "Event",
+                "MessageId": "ResourceEvent.1.0.3.ResourceChanged",
+                "Message": f"PowerState changed to {state}",
+                "MessageArgs": [],
+                "OriginOfCondition": link(f"{SERVICE_ROOT}/Systems/system"),
+            }],
+        })
+
+    async def _update_sensors(self):
+        thermal = f"{SERVICE_ROOT}/Chassis/chassis/Thermal"
+        while True:
+            powered = self.resources[f"{SERVICE_ROOT}/Systems/system"]["PowerState"] == "On"
+            for sensor in self.resources[thermal]["Temperatures"]:
+                target = 45.0 if powered else 25.0
+                reading = sensor["ReadingCelsius"] + (target - sensor["ReadingCelsius"]) * 0.1
+                sensor["ReadingCelsius"] = round(reading + random.uniform(-0.5, 0.5), 1)
+            for fan in self.resources[thermal]["Fans"]:
+                fan["Reading"] = random.randint(6800, 7200) if powered else 0
+            self._changed(thermal)
+            self._sync_sensors()
+            await asyncio.sleep(self.sensor_period)
+
+    def _sync_sensors(self):
+        thermal = self.resources[f"{SERVICE_ROOT}/Chassis/chassis/Thermal"]
+        readings = [(f"temperature_{sensor['Name']}", sensor["ReadingCelsius"]) for sensor in thermal["Temperatures"]]
+        readings += [(f"fan_tach_{fan['Name']}", fan["Reading"]) for fan in thermal["Fans"]]
+        metrics = []
+        for sensor_id, reading in readings:
+            path = f"{SERVICE_ROOT}/Chassis/chassis/Sensors/{sensor_id}"
+            self.resources[path]["Reading"] = reading
+            self._changed(path)
+            if sensor_id.startswith("temperature_"):
+                metrics.append({"DataSourceUri": path, "Reading": reading})
+        thermal_metrics = f"{SERVICE_ROOT}/Chassis/chassis/ThermalSubSystem/ThermalMetrics"
+        self.resources[thermal_metrics]["TemperatureReadingsCelsius"] = metrics
+        self._changed(thermal_metrics)
+        self._publish({
+            "@odata.type": "#MetricReport.v1_4_2.MetricReport",
+            "Id": "PlatformSensors",
+            "Timestamp": time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()),
+            "MetricValues": [
+                {"MetricProperty": f"{SERVICE_ROOT}/Chassis/chassis/Sensors/{sensor_id}/Reading",
+                 "MetricValue": str(reading)}
+                for sensor_id, reading in readings
+            ],
+        })
+
+    def _publish(self, event):
+        if not self._sse_queues:
+            return
+        self._sse_id += 1
+        message = f"id: {self._sse_id}\ndata: {json.dumps(event)}\n\n".encode()
+        for queue in self._sse_queues:
+            if queue.qsize() < 100:
+                queue.put_nowait(message)
+
+    async def _stream_events(self, writer):
+        queue = asyncio.Queue()
+        self._sse_queues.add(queue)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                         b"Connection: close\r\n\r\n")
+            await writer.drain()
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        finally:
+            self._sse_queues.discard(queue)
+
+    async def _power_sequence(self, reset_type):
+        if reset_type in ("ForceOff", "GracefulShutdown", "GracefulRestart", "ForceRestart", "PowerCycle"):
+            self.set_power_state("PoweringOff")
+            await asyncio.sleep(self.off_delay)
+            self.set_power_state("Off")
+        if reset_type in ("On", "ForceOn", "GracefulRestart", "ForceRestart", "PowerCycle"):
+            self.set_power_state("PoweringOn")
+            await asyncio.sleep(self.on_delay)
+            self.resources[f"{SERVICE_ROOT}/Systems/system"]["LastResetTime"] = timestamp()
+            self.set_power_state("On")
+
+    def _authorized(self, headers):
+        token = headers.get("x-auth-token")
+        if token:
+            return any(session["token"] == token for session in self.sessions.values())
+        authorization = headers.get("authorization", "")
+        if authorization.startswith("Basic "):
+            try:
+                credentials = base64.b64decode(authorization[6:]).decode()
+            except ValueError:
+                return False
+            return credentials == f"{self.username}:{self.password}"
+        return False
+
+    def _create_session(self, body):
+        if body.get("UserName") != self.username or body.get("Password") != self.password:
+            return 401, {}, redfish_error("ResourceAtUriUnauthorized", "Invalid username or password")
+        if len(self.sessions) >= self.max_sessions:
+            return 503, {}, redfish_error("ServiceTemporarilyUnavailable", "Session limit reached")
+        session_id = secrets.token_hex(5)
+        token = secrets.token_urlsafe(15)
+        path = f"{SERVICE_ROOT}/SessionService/Sessions/{session_id}"
+        self.sessions[session_id] = {"token": token, "path": path}
+        self.resources[path] = {
+            "@odata.id": path,
+            "@odata.type": "#Session.v1_5_0.Session",
+            "Id": session_id,
+            "Name": "User Session",
+            "UserName": self.username,
+        }
+        self._refresh_sessions()
+        return 201, {"X-Auth-Token": token, "Location": path}, self.resources[path]
+
+    def _delete_session(self, path):
+        session_id = path.rsplit("/", 1)[-1]
+        if session_id not in self.sessions:
+            return 404, {}, redfish_error("ResourceNotFound", f"{path} not found")
+        del self.sessions[session_id]
+        self.resources.pop(path, None)
+        self._changed(path)
+        self._refresh_sessions()
+        return 200, {}, None
+
+    def _reset(self, body):
+        reset_type = body.get("ResetType")
+        if reset_type not in RESET_TYPES:
+            return 400, {}, redfish_error("ActionParameterValueNotInList", f"ResetType {reset_type} not allowed")
+        if self._power_task and not self._power_task.done():
+            self._power_task.cancel()
+        self._power_task = asyncio.get_running_loop().create_task(self._power_sequence(reset_type))
+        return 204, {}, None
+
+    def _patch(self, path, body):
+        if not isinstance(body, dict) or not body:
+            return 400, {}, redfish_error("MalformedJSON", "PATCH body must be a non-empty object")
+        writable = WRITABLE.get(path, {})
+        for name, value in body.items():
+            if name not in self.resources[path]:
+                return 400, {}, redfish_error("PropertyUnknown", f"{name} is not a known property")
+            if name not in writable:
+                return 400, {}, redfish_error("PropertyNotWritable", f"{name} is read-only")
+            kind, limits = writable[name]
+            # bool - подкласс int, SessionTimeout: true не принимается
+            if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+                return 400, {}, redfish_error("PropertyValueTypeError", f"{name} has invalid type")
+            if limits and not limits[0] <= value <= limits[1]:
+                return 400, {}, redfish_error("PropertyValueOutOfRange", f"{name} is out of range")
+        self.resources[path].update(body)
+        self._changed(path)
+        return 204, {}, None
+
+    def _query(self, path, query):
+        resource = self.resources[path]
+        if "$expand" in query and "$select" in query:
+            return 400, {}, redfish_error("QueryCombinationInvalid", "$expand cannot be combined with $select")
+        if "$expand" in query and "Members" in resource:
+            expanded = dict(resource)
+            expanded["Members"] = [self.resources.get(member["@odata.id"], member) for member in resource["Members"]]
+            return 200, {}, expanded
+        if "$select" in query:
+            fields = query["$select"][0].split(",")
+            selected = {key: value for key, value in resource.items() if key.startswith("@odata.") or key in fields}
+            return 200, {}, selected
+        return 200, {}, path
+
+    def dispatch(self, method, path, headers, body):
+        url = urlsplit(path)
+        path = url.path.rstrip("/") or "/"
+        query = parse_qs(url.query) if self.expand else {}
+        sessions = f"{SERVICE_ROOT}/SessionService/Sessions"
+
+        if self.error_rate and random.random() < self.error_rate:
+            return 500, {}, redfish_error("InternalError", "Injected fault")
+
+        if method == "POST" and path == sessions:
+            return self._create_session(body)
+        if path != SERVICE_ROOT and not self._authorized(headers):
+            return 401, {}, redfish_error("ResourceAtUriUnauthorized", "Unauthorized")
+
+        if method == "GET":
+            if path not in self.resources:
+                return 404, {}, redfish_error("ResourceNotFound", f"{path} not found")
+            return self._query(path, query)
+        if method == "DELETE" and path.startswith(sessions + "/"):
+            return self._delete_session(path)
+        if method == "POST" and path == f"{SERVICE_ROOT}/Systems/system/Actions/ComputerSystem.Reset":
+            return self._reset(body)
+        if method == "PATCH" and path in self.resources:
+            return self._patch(path, body)
+        if path in self.resources:
+            return 405, {}, redfish_error("OperationNotAllowed", f"{method} not allowed on {path}")
+        return 404, {}, redfish_error("ResourceNotFound", f"{path} not found")
+
+    def build_response(self, method, path, headers, body):
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {}, json.dumps(redfish_error("MalformedJSON", "Malformed JSON")).encode()
+        status, extra_headers, result = self.dispatch(method, path, headers, payload)
+        if isinstance(result, str):
+            content, etag = self._encode(result)
+            if headers.get("if-none-match") == etag:
+                return 304, {"ETag": etag}, b""
+            return status, {"ETag": etag}, content
+        return status, extra_headers, json.dumps(result).encode() if result is not None else b""
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, version = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                sse = self.resources[f"{SERVICE_ROOT}/EventService"]["ServerSentEventUri"]
+                if method == "GET" and urlsplit(target).path == sse and self._authorized(headers):
+                    await self._stream_events(writer)
+                    break
+
+                delay = self.latency()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                status, extra_headers, content = self.build_response(method.upper(), target, headers, body)
+                self.requests_served += 1
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                response_headers = {
+                    "Date": formatdate(usegmt=True),
+                    "Content-Length": str(len(content)),
+                    "OData-Version": "4.0",
+                    "Connection": "keep-alive" if keep_alive else "close",
+                }
+                if content:
+                    response_headers["Content-Type"] = "application/json"
+                response_headers.update(extra_headers)
+                lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+                lines += [f"{name}: {value}" for name, value in response_headers.items()]
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=2443, ssl_context=None):
+        sensors = asyncio.get_running_loop().create_task(self._update_sensors())
+        server = await asyncio.start_server(self.handle, host, port, ssl=ssl_context, backlog=1024)
+        scheme = "https" if ssl_context else "http"
+        print(f"Эмулятор Redfish запущен на {scheme}://{host}:{port}{SERVICE_ROOT}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sensors.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Локальный эмулятор Redfish OpenBMC")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2443)
+    parser.add_argument("--certfile", help="PEM-сертификат для HTTPS; без него сервер работает по HTTP")
+    parser.add_argument("--keyfile")
+    parser.add_argument("--latency", default=None,
+                        help="распределение задержки: fixed:S, uniform:A:B, normal:MU:SIGMA, lognormal:MU:SIGMA, exp:MEAN")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля запросов, завершающихся HTTP 500")
+    parser.add_argument("--max-sessions", type=int, default=64)
+    parser.add_argument("--off-delay", type=float, default=2.0, help="секунд до PowerState=Off после Reset")
+    parser.add_argument("--on-delay", type=float, default=5.0, help="секунд до PowerState=On после Reset")
+    parser.add_argument("--no-expand", action="store_true",
+                        help="не поддерживать $expand/$select, как старые прошивки")
+    parser.add_argument("--username", default="root")
+    parser.add_argument("--password", default="0penBmc")
+    args = parser.parse_args(argv)
+
+    ssl_context = None
+    if args.certfile:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(args.certfile, args.keyfile)
+
+    emulator = RedfishEmulator(
+        username=args.username,
+        password=args.password,
+        latency=parse_latency(args.latency),
+        error_rate=args.error_rate,
+        max_sessions=args.max_sessions,
+        off_delay=args.off_delay,
+        on_delay=args.on_delay,
+        expand=not args.no_expand,
+    )
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    started = time.perf_counter()
+    try:
+        asyncio.run(emulator.serve(args.host, args.port, ssl_context))
+    except KeyboardInterrupt:
+        elapsed = time.perf_counter() - started
+        print(f"Обработано запросов: {emulator.requests_served} за {elapsed:.0f} с")
+
+
+if __name__ == "__main__":
+    main()
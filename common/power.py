@@ -0,0 +1,249 @@
+import argparse
+import json
+import statistics
+import threading
+import time
+
+import requests
+
+from common.config import BMC_URL, TIMEOUT
+from common.session import PooledAuth, SessionPool
+from common.telemetry import iter_events
+from common.timing import percentile
+
+SYSTEM = "/redfish/v1/Systems/system"
+
+OFF_TYPES = ["ForceOff", "GracefulShutdown"]
+ON_TYPES = ["On", "ForceOn"]
+RESTART_TYPES = ["GracefulRestart", "ForceRestart", "PowerCycle"]
+BENCHMARK_RESET_TYPES = ["GracefulRestart", "ForceRestart", "PowerCycle", "GracefulShutdown", "ForceOff", "On"]
+
+# состояния загрузки хоста, после которых система считается готовой
+READY_BOOT_STATES = ["OSRunning", "OSBootStarted", "SystemHardwareInitializationComplete"]
+
+PHASES = ["time_to_off", "time_to_on", "time_to_ready"]
+
+
+class PowerStateWatcher:
+    """Будит ожидающего при событиях SSE по Systems/system, чтобы не ждать следующего опроса."""
+
+    def __init__(self, session, host=BMC_URL, timeout=TIMEOUT):
+        self.session = session
+        self.host = host.rstrip("/")
+        self.timeout = timeout
+        self.changed = threading.Event()
+        self.available = False
+        self._stream = None
+        self._stop = threading.Event()
+
+    def start(self):
+        try:
+            response = self.session.get(f"{self.host}/redfish/v1/EventService", timeout=self.timeout)
+            sse_uri = response.json().get("ServerSentEventUri") if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            sse_uri = None
+        if sse_uri:
+            threading.Thread(target=self._run, args=(sse_uri,), name="power-events", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._stream is not None:
+            self._stream.close()
+
+    def _run(self, sse_uri):
+        while not self._stop.is_set():
+            try:
+                self._stream = self.session.get(f"{self.host}{sse_uri}", headers={"Accept": "text/event-stream"},
+                                                stream=True, timeout=(self.timeout, None))
+                with self._stream as response:
+                    if response.status_code != 200:
+                        return
+                    self.available = True
+                    for event in iter_events(response):
+                        for entry in event.get("Events", []):
+                            origin = entry.get("OriginOfCondition", {})
+                            path = origin.get("@odata.id", "") if isinstance(origin, dict) else str(origin)
+                            if path.startswith(SYSTEM):
+                                self.changed.set()
+            except (requests.RequestException, ValueError, AttributeError):
+                if self._stop.wait(1.0):
+                    return
+            self.available = False
+
+
+class ResetBenchmark:
+    """Замер времени до Off, до On и до готовности Redfish после ComputerSystem.Reset."""
+
+    def __init__(self, session, host=BMC_URL, poll_min=0.2, poll_max=2.0, phase_timeout=600, timeout=TIMEOUT,
+                 use_events=True, restart_off_timeout=60):
+        self.session = session
+        self.host = host.rstrip("/")
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.phase_timeout = phase_timeout
+        self.restart_off_timeout = restart_off_timeout
+        self.timeout = timeout
+        self.watcher = PowerStateWatcher(session, host, timeout).start() if use_events else None
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+
+    def system(self):
+        try:
+            response = self.session.get(f"{self.host}{SYSTEM}", timeout=self.timeout)
+            return response.json() if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            return None
+
+    def reset(self, reset_type):
+        response = self.session.post(
+            f"{self.host}{SYSTEM}/Actions/ComputerSystem.Reset",
+            json={"ResetType": reset_type},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+    def wait_for(self, predicate, started, timeout=None):
+        """Секунды от started до выполнения predicate(system) или None по таймауту."""
+        interval = self.poll_min
+        last_state = None
+        deadline = time.perf_counter() + (timeout or self.phase_timeout)
+        while time.perf_counter() < deadline:
+            system = self.system()
+            if system is not None and predicate(system):
+                return time.perf_counter() - started
+            state = system.get("PowerState") if system else None
+            # пока состояние меняется - опрашиваем часто, в стабильном состоянии - реже
+            interval = self.poll_min if state != last_state else min(interval * 1.5, self.poll_max)
+            last_state = state
+            if self.watcher is not None and self.watcher.available:
+                self.watcher.changed.wait(self.poll_max)
+                self.watcher.changed.clear()
+            else:
+                time.sleep(interval)
+        return None
+
+    def ensure_state(self, state):
+        system = self.system()
+        if system is not None and system.get("PowerState") == state:
+            return
+        self.reset("On" if state == "On" else "ForceOff")
+        self.wait_for(lambda s: s.get("PowerState") == state, time.perf_counter())
+
+    def cycle(self, reset_type):
+        self.ensure_state("Off" if reset_type in ON_TYPES else "On")
+        before = self.system()
+        if self.watcher is not None:
+            self.watcher.changed.clear()
+
+        result = {"reset_type": reset_type, "time_to_off": None, "time_to_on": None, "time_to_ready": None}
+        started = time.perf_counter()
+        self.reset(reset_type)
+        if reset_type in OFF_TYPES:
+            result["time_to_off"] = self.wait_for(lambda s: s.get("PowerState") not in ("On", "PoweringOff"), started)
+        if reset_type in RESTART_TYPES:
+            # короткие Off и PoweringOn можно пропустить между опросами: тогда о перезагрузке говорит новое
+            # LastResetTime, а если BMC его не сообщает - фаза выключения ограничена restart_off_timeout
+            state = {}
+
+            def off_or_restarted(system):
+                state["last"] = system.get("PowerState")
+                return state["last"] not in ("On", "PoweringOff") or restarted(before, system)
+
+            time_to_off = self.wait_for(off_or_restarted, started, self.restart_off_timeout)
+            # момент выключения известен, только если его застали; для уже включенной системы он пропущен
+            result["time_to_off"] = time_to_off if state.get("last") != "On" else None
+        if reset_type in ON_TYPES + RESTART_TYPES:
+            result["time_to_on"] = self.wait_for(lambda s: s.get("PowerState") == "On", started)
+            if result["time_to_on"] is not None:
+                result["time_to_ready"] = self.wait_for(is_ready, started)
+        return result
+
+    def run(self, reset_types, cycles):
+        results = []
+        for _ in range(cycles):
+            for reset_type in reset_types:
+                result = self.cycle(reset_type)
+                print(f"{reset_type}: " + ", ".join(
+                    f"{phase}={value:.2f} с" for phase, value in result.items() if isinstance(value, float)))
+                results.append(result)
+        self.ensure_state("On")
+        return results
+
+
+def restarted(before, system):
+    """True, если система включилась заново после снимка before: сменилось время последнего сброса."""
+    last_reset = system.get("LastResetTime")
+    return before is not None and last_reset is not None and last_reset != before.get("LastResetTime")
+
+
+def is_ready(system):
+    if system.get("PowerState") != "On" or system.get("Status", {}).get("State") not in (None, "Enabled"):
+        return False
+    boot_state = system.get("BootProgress", {}).get("LastState")
+    return boot_state is None or boot_state in READY_BOOT_STATES
+
+
+def summarize(results):
+    summary = {}
+    for result in results:
+        phases = summary.setdefault(result["reset_type"], {phase: [] for phase in PHASES})
+        for phase in PHASES:
+            if result[phase] is not None:
+                phases[phase].append(result[phase])
+    return {
+        reset_type: {
+            phase: {
+                "count": len(values),
+                "min": min(values),
+                "mean": statistics.fmean(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values),
+            }
+            for phase, values in phases.items() if values
+        }
+        for reset_type, phases in summary.items()
+    }
+
+
+def print_summary(summary):
+    print(f"{'ResetType':<18} {'Фаза':<14} {'N':>3} {'min':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for reset_type, phases in summary.items():
+        for phase, stats in phases.items():
+            print(f"{reset_type:<18} {phase:<14} {stats['count']:>3} {stats['min']:>8.2f} {stats['p50']:>8.2f} "
+                  f"{stats['p95']:>8.2f} {stats['p99']:>8.2f} {stats['max']:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк ComputerSystem.Reset")
+    parser.add_argument("--host", default=BMC_URL)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--reset-types", default=",".join(BENCHMARK_RESET_TYPES))
+    parser.add_argument("--phase-timeout", type=float, default=600)
+    parser.add_argument("--no-events", action="store_true", help="не использовать SSE, только опрос")
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    pool = SessionPool(1, base_url=f"{args.host.rstrip('/')}/redfish/v1")
+    session = requests.Session()
+    session.verify = False
+    session.auth = PooledAuth(pool)
+    benchmark = ResetBenchmark(session, args.host, phase_timeout=args.phase_timeout, use_events=not args.no_events)
+    try:
+        results = benchmark.run(args.reset_types.split(","), args.cycles)
+    finally:
+        benchmark.close()
+        pool.close()
+    summary = summarize(results)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"cycles": results, "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
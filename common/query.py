@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from common.config import BMC_URL, TIMEOUT
+
+SERVICE_ROOT = "/redfish/v1"
+
+
+def select_fields(resource, fields):
+    if not fields:
+        return resource
+    selected = {key: resource[key] for key in ("@odata.id", "@odata.type") if key in resource}
+    for field in fields:
+        if field in resource:
+            selected[field] = resource[field]
+    return selected
+
+
+class RedfishQuery:
+    """Получение коллекций одним запросом через $expand/$select, либо параллельным обходом на старых прошивках."""
+
+    def __init__(self, session, host=BMC_URL, concurrency=8, timeout=TIMEOUT):
+        self.session = session
+        self.host = host.rstrip("/")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._features = None
+
+    def _get(self, path, params=None):
+        response = self.session.get(f"{self.host}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @property
+    def features(self):
+        if self._features is None:
+            supported = self._get(SERVICE_ROOT).get("ProtocolFeaturesSupported", {})
+            expand = supported.get("ExpandQuery", {})
+            if expand.get("NoLinks"):
+                expand_param = ".($levels=1)" if expand.get("Levels") else "."
+            elif expand.get("ExpandAll"):
+                expand_param = "*($levels=1)" if expand.get("Levels") else "*"
+            else:
+                expand_param = None
+            self._features = {"expand": expand_param, "select": bool(supported.get("SelectQuery"))}
+        return self._features
+
+    def get(self, path, fields=None):
+        if fields and self.features["select"]:
+            return select_fields(self._get(path, {"$select": ",".join(fields)}), fields)
+        return select_fields(self._get(path), fields)
+
+    def members(self, path, fields=None):
+        """Все члены коллекции path с полями fields (все поля, если fields не задан)."""
+        expand = self.features["expand"]
+        if expand:
+            # bmcweb отклоняет $select вместе с $expand (QueryCombinationInvalid), поля отбираются на клиенте
+            response = self.session.get(f"{self.host}{path}", params={"$expand": expand}, timeout=self.timeout)
+            if response.status_code == 200:
+                members = response.json().get("Members", [])
+                # сервис мог проигнорировать $expand и вернуть только ссылки
+                if all(set(member) - {"@odata.id"} for member in members):
+                    return [select_fields(member, fields) for member in members]
+        return self._fan_out(path, fields)
+
+    def _fan_out(self, path, fields):
+        links = [member["@odata.id"] for member in self._get(path).get("Members", [])]
+        if not links:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(links))) as pool:
+            return list(pool.map(lambda link: self.get(link, fields), links))
@@ -0,0 +1,133 @@
+import argparse
+import json
+import socket
+import sys
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from common.config import BMC_URL, USERNAME, PASSWORD
+from common.session import RedfishAuthError, login, logout
+
+PROBE_TIMEOUT = 5
+
+# фазы загрузки в порядке появления: порт -> bmcweb -> аутентификация -> инвентарь системы
+PHASES = ["tcp", "service_root", "session_service", "system"]
+
+
+class BootTimeout(Exception):
+    pass
+
+
+def backoff(initial=0.25, factor=2.0, maximum=5.0):
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * factor, maximum)
+
+
+class ReadinessProbe:
+    """Ждет готовности BMC по фазам и запоминает, сколько секунд от старта заняла каждая."""
+
+    def __init__(self, host=BMC_URL, username=USERNAME, password=PASSWORD, timeout=300, started_at=None,
+                 initial_delay=0.25, max_delay=5.0):
+        self.host = host.rstrip("/")
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        # время запуска QEMU (epoch), чтобы фазы считались от старта машины, а не пробы
+        self.started_at = started_at or time.time()
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.phases = {}
+        self.attempts = {}
+        self.session = requests.Session()
+        self.session.verify = False
+        self._token = None
+        self._session_url = None
+
+    def elapsed(self):
+        return time.time() - self.started_at
+
+    def wait_for(self, phase, check):
+        attempts = 0
+        for delay in backoff(self.initial_delay, 2.0, self.max_delay):
+            attempts += 1
+            try:
+                if check():
+                    break
+            except (requests.RequestException, OSError, ValueError, RedfishAuthError):
+                pass
+            if self.elapsed() + delay > self.timeout:
+                raise BootTimeout(f"BMC не достиг фазы {phase} за {self.timeout} с")
+            time.sleep(delay)
+        self.phases[phase] = round(self.elapsed(), 3)
+        self.attempts[phase] = attempts
+        print(f"Фаза {phase}: {self.phases[phase]:.1f} с (попыток: {attempts})")
+
+    def check_tcp(self):
+        url = urlsplit(self.host)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        with socket.create_connection((url.hostname, port), timeout=PROBE_TIMEOUT):
+            return True
+
+    def check_service_root(self):
+        response = self.session.get(f"{self.host}/redfish/v1", timeout=PROBE_TIMEOUT)
+        return response.status_code == 200 and "SessionService" in response.json()
+
+    def check_session_service(self):
+        # сессия создается только когда SessionService и аутентификация (PAM/пользователи) уже подняты
+        self._token, self._session_url = login(self.session, f"{self.host}/redfish/v1", self.username,
+                                               self.password, PROBE_TIMEOUT)
+        return True
+
+    def check_system(self):
+        response = self.session.get(f"{self.host}/redfish/v1/Systems/system",
+                                    headers={"X-Auth-Token": self._token}, timeout=PROBE_TIMEOUT)
+        if response.status_code == 401:
+            # старая сессия могла уцелеть на BMC (401 во время перезапуска аутентификации) - закрываем ее перед новой
+            logout(self.session, self._token, self._session_url, PROBE_TIMEOUT)
+            self._token = self._session_url = None
+            self.check_session_service()
+            return False
+        return response.status_code == 200 and "PowerState" in response.json()
+
+    def run(self):
+        try:
+            for phase in PHASES:
+                self.wait_for(phase, getattr(self, f"check_{phase}"))
+        finally:
+            if self._token:
+                logout(self.session, self._token, self._session_url, PROBE_TIMEOUT)
+            self.session.close()
+        return self.phases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ожидание готовности Redfish на BMC")
+    parser.add_argument("--host", default=BMC_URL)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--started-at", type=float, help="время запуска QEMU (epoch), от него считаются фазы")
+    parser.add_argument("--max-delay", type=float, default=5.0, help="максимальная пауза между попытками")
+    parser.add_argument("--json", help="сохранить время фаз в JSON")
+    args = parser.parse_args(argv)
+
+    probe = ReadinessProbe(args.host, timeout=args.timeout, started_at=args.started_at, max_delay=args.max_delay)
+    try:
+        probe.run()
+        ready = True
+    except BootTimeout as e:
+        print(f"ОШИБКА: {e}")
+        ready = False
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"host": probe.host, "ready": ready, "phases": probe.phases, "attempts": probe.attempts}, f,
+                      indent=2)
+    if ready:
+        print(f"BMC готов: {probe.host} за {probe.phases['system']:.1f} с")
+    return 0 if ready else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
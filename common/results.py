@@ -0,0 +1,331 @@
+import argparse
+import csv
+import json
+import math
+import os
+import sqlite3
+import statistics
+import sys
+import time
+
+from common.timing import percentile
+
+DB_PATH = os.environ.get("PERF_DB", "perf_history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    build TEXT,
+    label TEXT NOT NULL,
+    created REAL NOT NULL,
+    passed INTEGER
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    source TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS latencies (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    source TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics(run_id, source, endpoint, metric);
+CREATE INDEX IF NOT EXISTS latencies_run ON latencies(run_id, source, endpoint);
+"""
+
+# у этих метрик рост - ухудшение, у rps - улучшение; count только хранится
+HIGHER_IS_WORSE = ["p50", "p95", "p99", "error_rate"]
+GATED_METRICS = HIGHER_IS_WORSE + ["rps"]
+
+# сколько выборок задержки из базовых прогонов брать в U-тест
+MAX_BASELINE_SAMPLES = 5000
+# меньше выборок в текущем прогоне - U-тест не проводится, только сравнение с историей перцентилей
+MIN_SAMPLES = 5
+
+
+def locust_stats_path(prefix):
+    # принимает и --csv Locust (".../locust_stats"), и сам файл ".../locust_stats_stats.csv"
+    return prefix if prefix.endswith(".csv") else f"{prefix}_stats.csv"
+
+
+def read_locust_stats(path):
+    """{запрос: метрики} из *_stats.csv Locust; строка Aggregated - общий итог."""
+    result = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            count = int(row["Request Count"])
+            if not count:
+                continue
+            name = row["Name"] if row["Name"] == "Aggregated" else f"{row['Type']} {row['Name']}"
+            result[name] = {
+                "count": count,
+                "error_rate": int(row["Failure Count"]) / count,
+                "rps": float(row["Requests/s"]),
+                "p50": float(row["50%"]),
+                "p95": float(row["95%"]),
+                "p99": float(row["99%"]),
+            }
+    return result
+
+
+def read_api_timings(path):
+    """({endpoint: метрики}, {endpoint: задержки в мс}) из --timings-json redfish_api_tests."""
+    with open(path) as f:
+        records = json.load(f)["records"]
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record["endpoint"], []).append(record)
+    metrics, samples = {}, {}
+    for endpoint, records in sorted(grouped.items()):
+        # ответы с ошибкой не входят в задержку: 404 отдается быстрее, чем ресурс
+        values = [r["total"] * 1000 for r in records if r["status"] < 400]
+        metrics[endpoint] = {"count": len(records), "error_rate": 1 - len(values) / len(records)}
+        if values:
+            metrics[endpoint].update({"p50": percentile(values, 50), "p95": percentile(values, 95),
+                                      "p99": percentile(values, 99)})
+            samples[endpoint] = values
+    return metrics, samples
+
+
+class ResultsStore:
+    """История прогонов в SQLite: метрики по запросам и сырые задержки API."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def add_run(self, label, build=None):
+        with self.db:
+            cursor = self.db.execute("INSERT INTO runs (build, label, created) VALUES (?, ?, ?)",
+                                     (build, label, time.time()))
+        return cursor.lastrowid
+
+    def add_metrics(self, run_id, source, metrics):
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO metrics (run_id, source, endpoint, metric, value) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, source, endpoint, metric, value)
+                 for endpoint, values in metrics.items() for metric, value in values.items()])
+
+    def add_latencies(self, run_id, source, samples):
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO latencies (run_id, source, endpoint, value) VALUES (?, ?, ?, ?)",
+                [(run_id, source, endpoint, value) for endpoint, values in samples.items() for value in values])
+
+    def mark(self, run_id, passed):
+        with self.db:
+            self.db.execute("UPDATE runs SET passed = ? WHERE id = ?", (int(passed), run_id))
+
+    def baseline_runs(self, label, before, window):
+        # прогоны с найденной регрессией в базовую линию не входят, иначе она постепенно сползет
+        rows = self.db.execute(
+            "SELECT id FROM runs WHERE label = ? AND id < ? AND passed = 1 ORDER BY id DESC LIMIT ?",
+            (label, before, window))
+        return [row[0] for row in rows]
+
+    def metrics(self, run_ids):
+        """{(source, endpoint, metric): [значение по каждому прогону]}."""
+        result = {}
+        if not run_ids:
+            return result
+        marks = ",".join("?" * len(run_ids))
+        rows = self.db.execute(
+            f"SELECT source, endpoint, metric, value FROM metrics WHERE run_id IN ({marks}) ORDER BY run_id",
+            run_ids)
+        for source, endpoint, metric, value in rows:
+            result.setdefault((source, endpoint, metric), []).append(value)
+        return result
+
+    def latencies(self, run_ids, source, endpoint, limit=MAX_BASELINE_SAMPLES):
+        if not run_ids:
+            return []
+        marks = ",".join("?" * len(run_ids))
+        rows = self.db.execute(
+            f"SELECT value FROM latencies WHERE run_id IN ({marks}) AND source = ? AND endpoint = ? "
+            f"ORDER BY rowid DESC LIMIT ?", [*run_ids, source, endpoint, limit])
+        return [row[0] for row in rows]
+
+
+def mann_whitney_greater(current, baseline):
+    """p-value одностороннего U-теста Манна-Уитни (нормальное приближение с поправкой на связи):
+    задержки current стохастически больше baseline."""
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    n = n1 + n2
+    rank_sum = 0.0
+    ties = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        # одинаковые значения получают средний ранг
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def robust_z(value, history):
+    """Отклонение от медианы истории в единицах MAD (устойчиво к единичным выбросам в истории)."""
+    median = statistics.median(history)
+    mad = statistics.median(abs(v - median) for v in history) * 1.4826
+    if mad == 0:
+        return 0.0 if value == median else math.copysign(math.inf, value - median)
+    return (value - median) / mad
+
+
+def compare(store, run_id, label, window=10, min_runs=3, threshold=0.2, z_limit=3.0, alpha=0.01,
+            min_delta_ms=5.0, max_error_increase=0.01):
+    """Сравнивает прогон с базовой линией из последних window успешных прогонов того же label.
+
+    Регрессия - изменение в худшую сторону больше threshold (доли от медианы базовой линии),
+    больше абсолютного порога и статистически значимое: U-тест по сырым задержкам, если их
+    достаточно, иначе устойчивый z-score по истории значений метрики."""
+    baseline = store.baseline_runs(label, run_id, window)
+    history = store.metrics(baseline)
+    findings = []
+    for (source, endpoint, metric), (value,) in sorted(store.metrics([run_id]).items()):
+        if metric not in GATED_METRICS:
+            continue
+        values = history.get((source, endpoint, metric), [])
+        finding = {"source": source, "endpoint": endpoint, "metric": metric, "current": value,
+                   "baseline": statistics.median(values) if values else None, "runs": len(values),
+                   "change": None, "test": None, "score": None, "status": "new"}
+        findings.append(finding)
+        if len(values) < min_runs:
+            continue
+        base = finding["baseline"]
+        worse = value - base if metric in HIGHER_IS_WORSE else base - value
+        finding["change"] = (value - base) / base if base else None
+        if metric == "error_rate":
+            significant_size = worse > max_error_increase
+        else:
+            relative = worse / base if base else math.inf
+            significant_size = relative > threshold and (metric == "rps" or worse > min_delta_ms)
+
+        current_samples = store.latencies([run_id], source, endpoint) if metric == "p50" else []
+        if len(current_samples) >= MIN_SAMPLES:
+            baseline_samples = store.latencies(baseline, source, endpoint)
+            if metric in HIGHER_IS_WORSE:
+                p_value = mann_whitney_greater(current_samples, baseline_samples)
+            else:
+                p_value = mann_whitney_greater(baseline_samples, current_samples)
+            finding.update(test="mann-whitney", score=p_value)
+            significant = p_value < alpha
+        else:
+            z = robust_z(value, values)
+            finding.update(test="robust-z", score=z if metric in HIGHER_IS_WORSE else -z)
+            significant = finding["score"] > z_limit
+
+        if significant_size and significant:
+            finding["status"] = "regression"
+        elif worse < 0 and abs(finding["change"] or 0) > threshold:
+            finding["status"] = "improvement"
+        else:
+            finding["status"] = "ok"
+    return findings
+
+
+def format_value(metric, value):
+    if value is None:
+        return "-"
+    if metric == "error_rate":
+        return f"{value:.2%}"
+    if metric == "rps":
+        return f"{value:.1f}"
+    return f"{value:.1f} мс"
+
+
+def print_report(findings, verbose=False):
+    shown = [f for f in findings if verbose or f["status"] in ("regression", "improvement")]
+    counts = {}
+    for finding in findings:
+        counts[finding["status"]] = counts.get(finding["status"], 0) + 1
+    print("Сравнение с базовой линией: " + ", ".join(f"{status}: {n}" for status, n in sorted(counts.items())))
+    if not shown:
+        return
+    print(f"{'Источник':<8} {'Запрос':<60} {'Метрика':<10} {'База':>11} {'Сейчас':>11} {'Изм.':>8} "
+          f"{'Тест':<13} {'Оценка':>8}  Итог")
+    for f in shown:
+        change = f"{f['change']:+.0%}" if f["change"] is not None else "-"
+        score = "-" if f["score"] is None else (f"{f['score']:.4f}" if f["test"] == "mann-whitney"
+                                                else f"{f['score']:.1f}")
+        print(f"{f['source']:<8} {f['endpoint'][:60]:<60} {f['metric']:<10} "
+              f"{format_value(f['metric'], f['baseline']):>11} {format_value(f['metric'], f['current']):>11} "
+              f"{change:>8} {f['test'] or '-':<13} {score:>8}  {f['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="История результатов производительности и контроль регрессий")
+    parser.add_argument("--db", default=DB_PATH, help="файл SQLite с историей прогонов")
+    parser.add_argument("--label", default=os.environ.get("PERF_LABEL", "default"),
+                        help="сравниваются только прогоны с одинаковой меткой (конфигурация стенда)")
+    parser.add_argument("--build", default=os.environ.get("BUILD_NUMBER"), help="номер сборки для истории")
+    parser.add_argument("--locust-csv", help="префикс --csv Locust или файл *_stats.csv")
+    parser.add_argument("--timings", help="JSON --timings-json из redfish_api_tests")
+    parser.add_argument("--window", type=int, default=10, help="число последних успешных прогонов в базовой линии")
+    parser.add_argument("--min-runs", type=int, default=3, help="меньше прогонов в истории - метрика не проверяется")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимое ухудшение, доля от базовой линии")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="меньшее ухудшение задержки не считается")
+    parser.add_argument("--max-error-increase", type=float, default=0.01, help="допустимый рост доли ошибок")
+    parser.add_argument("--z-limit", type=float, default=3.0, help="порог устойчивого z-score")
+    parser.add_argument("--alpha", type=float, default=0.01, help="уровень значимости U-теста")
+    parser.add_argument("--accept", action="store_true",
+                        help="принять прогон в базовую линию даже с регрессиями (ожидаемое изменение)")
+    parser.add_argument("--json", help="сохранить сравнение в JSON")
+    parser.add_argument("--verbose", action="store_true", help="показать все метрики, а не только изменения")
+    args = parser.parse_args(argv)
+
+    store = ResultsStore(args.db)
+    try:
+        run_id = store.add_run(args.label, args.build)
+        if args.locust_csv:
+            path = locust_stats_path(args.locust_csv)
+            if os.path.exists(path):
+                store.add_metrics(run_id, "locust", read_locust_stats(path))
+            else:
+                print(f"Нет статистики Locust: {path}")
+        if args.timings:
+            if os.path.exists(args.timings):
+                metrics, samples = read_api_timings(args.timings)
+                store.add_metrics(run_id, "api", metrics)
+                store.add_latencies(run_id, "api", samples)
+            else:
+                print(f"Нет замеров API: {args.timings}")
+        findings = compare(store, run_id, args.label, args.window, args.min_runs, args.threshold, args.z_limit,
+                           args.alpha, args.min_delta_ms, args.max_error_increase)
+        regressions = [f for f in findings if f["status"] == "regression"]
+        store.mark(run_id, args.accept or not regressions)
+    finally:
+        store.close()
+
+    print_report(findings, args.verbose)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"run": run_id, "label": args.label, "build": args.build, "findings": findings}, f,
+                      indent=2, ensure_ascii=False)
+    if regressions:
+        print(f"ОШИБКА: регрессия производительности в {len(regressions)} метриках (прогон {run_id})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
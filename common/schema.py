@@ -0,0 +1,188 @@
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import unquote, urlsplit
+
+import fastjsonschema
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCHEMA_DIR = os.environ.get("REDFISH_SCHEMA_DIR", os.path.join(ROOT, "schemas", "redfish"))
+CACHE_DIR = os.environ.get("REDFISH_SCHEMA_CACHE", os.path.join(ROOT, ".schema_cache"))
+
+ODATA_TYPE = re.compile(r"^#(?P<namespace>[A-Za-z0-9_]+(?:\.v\d+_\d+_\d+)?)\.(?P<name>[A-Za-z0-9_]+)$")
+
+# скомпилированные валидаторы внутри процесса: имя -> функция validate
+_validators = {}
+
+
+class SchemaNotFound(Exception):
+    pass
+
+
+def schema_key(odata_type):
+    """#ComputerSystem.v1_16_0.ComputerSystem -> ("ComputerSystem.v1_16_0", "ComputerSystem")."""
+    match = ODATA_TYPE.match(odata_type or "")
+    if not match:
+        raise SchemaNotFound(f"Непонятный @odata.type: {odata_type}")
+    return match.group("namespace"), match.group("name")
+
+
+def load_schema_file(uri, schema_dir=SCHEMA_DIR):
+    # ссылки вида http://redfish.dmtf.org/schemas/v1/Resource.json разрешаются в локальный файл
+    path = os.path.join(schema_dir, os.path.basename(urlsplit(uri).path))
+    if not os.path.exists(path):
+        raise SchemaNotFound(f"Нет локальной схемы {os.path.basename(path)}")
+    with open(path) as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def bundle_hash(schema_dir=SCHEMA_DIR):
+    """Хэш файлов схем: после обновления набора схем валидаторы компилируются заново, а не берутся из кэша."""
+    if not os.path.isdir(schema_dir):
+        raise SchemaNotFound(f"Нет каталога схем {schema_dir}")
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(schema_dir)):
+        if name.endswith(".json"):
+            digest.update(name.encode())
+            with open(os.path.join(schema_dir, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def compile_validator(namespace, name, schema_dir=SCHEMA_DIR, cache_dir=CACHE_DIR):
+    """Компилирует валидатор типа в Python-модуль в cache_dir (один раз на тип и набор схем) и возвращает путь к нему."""
+    cache_dir = os.path.join(cache_dir, f"fastjsonschema-{fastjsonschema.VERSION}-{bundle_hash(schema_dir)}")
+    path = os.path.join(cache_dir, f"{namespace}.{name}.py".replace("-", "_"))
+    if os.path.exists(path):
+        return path
+
+    schema = load_schema_file(f"{namespace}.json", schema_dir)
+    base_uri = schema.get("$id", f"http://redfish.dmtf.org/schemas/v1/{namespace}.json")
+    handler = lambda uri: load_schema_file(uri, schema_dir)
+    code = fastjsonschema.compile_to_code(
+        {"$ref": f"{base_uri}#/definitions/{name}"},
+        handlers={"http": handler, "https": handler},
+        use_default=False,
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    # запись через временный файл: кэш могут одновременно заполнять несколько процессов
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(code)
+    os.replace(tmp_path, path)
+    return path
+
+
+def get_validator(odata_type, schema_dir=SCHEMA_DIR, cache_dir=CACHE_DIR):
+    key = schema_key(odata_type)
+    if key not in _validators:
+        path = compile_validator(*key, schema_dir=schema_dir, cache_dir=cache_dir)
+        spec = importlib.util.spec_from_file_location(f"redfish_schema_{len(_validators)}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _validators[key] = module.validate
+    return _validators[key]
+
+
+def validate_resource(data, schema_dir=SCHEMA_DIR, cache_dir=CACHE_DIR):
+    """None, если ресурс соответствует схеме; иначе текст ошибки. SchemaNotFound - если схемы нет."""
+    validate = get_validator(data.get("@odata.type"), schema_dir, cache_dir)
+    try:
+        validate(data)
+    except fastjsonschema.JsonSchemaValueException as e:
+        return e.message
+    return None
+
+
+def _check(task):
+    path, data, schema_dir, cache_dir = task
+    try:
+        return path, validate_resource(data, schema_dir, cache_dir), None
+    except SchemaNotFound as e:
+        return path, None, str(e)
+    except fastjsonschema.JsonSchemaDefinitionException as e:
+        return path, None, f"Схема не компилируется: {e}"
+
+
+def _precompile(task):
+    odata_type, schema_dir, cache_dir = task
+    try:
+        compile_validator(*schema_key(odata_type), schema_dir=schema_dir, cache_dir=cache_dir)
+    except (SchemaNotFound, fastjsonschema.JsonSchemaDefinitionException):
+        pass
+
+
+class SchemaValidator:
+    """Проверка ответов Redfish по схемам DMTF в пуле процессов; валидаторы кэшируются на диске между запусками."""
+
+    def __init__(self, workers=None, schema_dir=SCHEMA_DIR, cache_dir=CACHE_DIR):
+        self.schema_dir = schema_dir
+        self.cache_dir = cache_dir
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.current_test = None
+        self.skipped = {}
+        self._pending = {}
+        self._compiled = set()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return os.path.isdir(self.schema_dir)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    def precompile(self, odata_types):
+        # компиляция - самая дорогая часть: по одной задаче на тип, чтобы процессы не компилировали одно и то же
+        missing = sorted({t for t in odata_types if t and t not in self._compiled})
+        list(self.pool.map(_precompile, [(t, self.schema_dir, self.cache_dir) for t in missing]))
+        self._compiled.update(missing)
+
+    def validate_many(self, resources):
+        """resources: {path: data} -> {path: ошибка или None}; ресурсы без локальной схемы пропускаются."""
+        self.precompile(data.get("@odata.type") for data in resources.values())
+        tasks = [(path, data, self.schema_dir, self.cache_dir) for path, data in resources.items()]
+        results = {}
+        for path, error, skipped in self.pool.map(_check, tasks, chunksize=max(1, len(tasks) // 64)):
+            if skipped:
+                self.skipped[path] = skipped
+            else:
+                results[path] = error
+        return results
+
+    def submit(self, response, **kwargs):
+        """Хук ответа requests: ставит JSON-ответ в очередь на проверку для текущего теста."""
+        if response.status_code != 200 or "json" not in response.headers.get("Content-Type", ""):
+            return response
+        # $select и $expand меняют форму ресурса: урезанный или развернутый ответ схеме не обязан соответствовать
+        query = unquote(urlsplit(response.url).query)
+        if "$select" in query or "$expand" in query:
+            return response
+        try:
+            data = response.json()
+        except ValueError:
+            return response
+        if "@odata.type" in data:
+            # валидатор компилируется в процессе пула внутри _check, а не здесь: хук не задерживает сам тест
+            future = self.pool.submit(_check, (response.url, data, self.schema_dir, self.cache_dir))
+            with self._lock:
+                self._pending.setdefault(self.current_test, []).append(future)
+        return response
+
+    def collect(self, test):
+        with self._lock:
+            futures = self._pending.pop(test, [])
+        errors = []
+        for future in futures:
+            path, error, skipped = future.result()
+            if skipped:
+                self.skipped[path] = skipped
+            elif error:
+                errors.append(f"{path}: {error}")
+        return errors
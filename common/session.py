@@ -0,0 +1,157 @@
+import itertools
+import threading
+
+import requests
+import urllib3
+from requests.auth import AuthBase
+
+from common.config import BASE_URL, USERNAME, PASSWORD, TIMEOUT
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+class RedfishAuthError(Exception):
+    pass
+
+
+def login(session, base_url=BASE_URL, username=USERNAME, password=PASSWORD, timeout=TIMEOUT):
+    response = session.post(
+        f"{base_url}/SessionService/Sessions",
+        json={"UserName": username, "Password": password},
+        headers={"X-Auth-Token": None},
+        verify=False,
+        timeout=timeout
+    )
+    if response.status_code not in [200, 201] or "X-Auth-Token" not in response.headers:
+        raise RedfishAuthError(f"Не удалось создать сессию: {response.status_code}")
+    session_id = response.json().get("Id", "")
+    return response.headers["X-Auth-Token"], f"{base_url}/SessionService/Sessions/{session_id}"
+
+
+def logout(session, token, session_url, timeout=TIMEOUT):
+    try:
+        session.delete(session_url, headers={"X-Auth-Token": token}, verify=False, timeout=timeout)
+    except Exception:
+        pass
+
+
+def create_session(base_url=BASE_URL, username=USERNAME, password=PASSWORD, timeout=TIMEOUT, session=None):
+    if session is None:
+        session = requests.Session()
+    session.verify = False
+
+    try:
+        token, session_url = login(session, base_url, username, password, timeout)
+    except (RedfishAuthError, requests.RequestException):
+        session.close()
+        raise
+
+    session.headers["X-Auth-Token"] = token
+    session.redfish_session_url = session_url
+    return session
+
+
+def close_session(session, timeout=TIMEOUT):
+    logout(session, session.headers.get("X-Auth-Token"), session.redfish_session_url, timeout)
+    session.close()
+
+
+class PooledToken:
+
+    def __init__(self, token, session_url):
+        self.token = token
+        self.session_url = session_url
+        self.lock = threading.Lock()
+
+
+class SessionPool:
+    """Фиксированный набор X-Auth-Token, общий для всех пользователей: BMC ограничивает число одновременных сессий."""
+
+    def __init__(self, size, base_url=BASE_URL, username=USERNAME, password=PASSWORD, timeout=TIMEOUT):
+        self.size = size
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.tokens = []
+        self.renewals = 0
+        self._http = requests.Session()
+        self._lock = threading.Lock()
+        self._cycle = None
+        self._closed = False
+
+    def _login(self):
+        return login(self._http, self.base_url, self.username, self.password, self.timeout)
+
+    def start(self):
+        with self._lock:
+            if self.tokens:
+                return
+            errors = []
+            for _ in range(self.size):
+                try:
+                    self.tokens.append(PooledToken(*self._login()))
+                except (RedfishAuthError, requests.RequestException) as e:
+                    errors.append(str(e))
+            if not self.tokens:
+                raise RedfishAuthError(f"Не удалось создать ни одной сессии: {errors[0]}")
+            if errors:
+                print(f"Создано сессий: {len(self.tokens)} из {self.size}, ошибка: {errors[0]}")
+            self._cycle = itertools.cycle(self.tokens)
+
+    def acquire(self):
+        if not self.tokens and not self._closed:
+            self.start()
+        with self._lock:
+            # закрытый пул не открывается заново: иначе пользователь, запущенный после close(), оставит сессии на BMC
+            if self._closed:
+                raise RuntimeError("session pool closed")
+            return next(self._cycle)
+
+    def renew(self, pooled, stale_token):
+        with pooled.lock:
+            # токен мог уже обновить другой пользователь, получивший 401 одновременно с нами
+            if pooled.token != stale_token or self._closed:
+                return
+            logout(self._http, pooled.token, pooled.session_url, self.timeout)
+            pooled.token, pooled.session_url = self._login()
+            self.renewals += 1
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            for pooled in self.tokens:
+                logout(self._http, pooled.token, pooled.session_url, self.timeout)
+            self.tokens = []
+            self._cycle = None
+
+
+class PooledAuth(AuthBase):
+    """Подставляет токен из SessionPool и при 401 прозрачно переавторизуется и повторяет запрос."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.pooled = pool.acquire()
+
+    def __call__(self, request):
+        request.headers["X-Auth-Token"] = self.pooled.token
+        request.register_hook("response", self.handle_401)
+        return request
+
+    def handle_401(self, response, **kwargs):
+        if response.status_code != 401 or getattr(response.request, "pool_retry", False):
+            return response
+        try:
+            self.pool.renew(self.pooled, response.request.headers.get("X-Auth-Token"))
+        except (RedfishAuthError, requests.RequestException):
+            return response
+
+        response.content
+        response.close()
+        retry = response.request.copy()
+        retry.headers["X-Auth-Token"] = self.pooled.token
+        retry.pool_retry = True
+        new_response = response.connection.send(retry, **kwargs)
+        new_response.history.append(response)
+        new_response.request = retry
+        return new_response
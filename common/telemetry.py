@@ -0,0 +1,230 @@
+import json
+import threading
+import time
+from array import array
+from collections import deque
+
+import requests
+
+from common.config import BMC_URL, TIMEOUT
+from common.query import RedfishQuery
+
+SERVICE_ROOT = "/redfish/v1"
+SENSORS = f"{SERVICE_ROOT}/Chassis/chassis/Sensors"
+THERMAL_METRICS = f"{SERVICE_ROOT}/Chassis/chassis/ThermalSubSystem/ThermalMetrics"
+# сколько интервалов ждать первого показания из SSE: поток без подписки на MetricReport может молчать бесконечно
+SSE_SILENCE = 10
+
+
+def iter_events(response, keepalive=False):
+    """Разбирает поток text/event-stream на JSON-события; keepalive=True - пинги-комментарии отдаются как None."""
+    data = []
+    # chunk_size=1: иначе iter_lines ждет заполнения 512-байтного блока и событие приходит с задержкой
+    for line in response.iter_lines(chunk_size=1, decode_unicode=True):
+        if keepalive and line.startswith(":"):
+            yield None
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+        elif not line and data:
+            yield json.loads("\n".join(data))
+            data = []
+
+
+class SensorSeries:
+    """Кольцевой буфер показаний одного датчика: два массива double фиксированной длины вместо списка словарей."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.start = 0
+        self.count = 0
+
+    def append(self, timestamp, value):
+        index = (self.start + self.count) % self.capacity
+        self.times[index] = timestamp
+        self.values[index] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def samples(self, since=None):
+        for offset in range(self.count):
+            index = (self.start + offset) % self.capacity
+            if since is None or self.times[index] >= since:
+                yield self.times[index], self.values[index]
+
+    def stats(self, window=None, now=None):
+        since = None if window is None else (now or time.monotonic()) - window
+        samples = list(self.samples(since))
+        if not samples:
+            return None
+        values = [value for _, value in samples]
+        (first_time, first_value), (last_time, last_value) = samples[0], samples[-1]
+        max_rate = 0.0
+        for (t1, v1), (t2, v2) in zip(samples, samples[1:]):
+            if t2 > t1:
+                max_rate = max(max_rate, abs(v2 - v1) / (t2 - t1))
+        return {
+            "count": len(samples),
+            "min": min(values),
+            "max": max(values),
+            "mean": sum(values) / len(values),
+            "last": last_value,
+            "rate": (last_value - first_value) / (last_time - first_time) if last_time > first_time else 0.0,
+            "max_rate": max_rate,
+        }
+
+
+class ThermalTelemetry:
+    """Фоновый сбор показаний датчиков: поток SSE EventService, при его отсутствии - опрос ThermalSubSystem."""
+
+    def __init__(self, session, host=BMC_URL, interval=1.0, capacity=3600, timeout=TIMEOUT, use_sse=True):
+        self.session = session
+        self.host = host.rstrip("/")
+        self.interval = interval
+        self.capacity = capacity
+        self.timeout = timeout
+        self.use_sse = use_sse
+        self.query = RedfishQuery(session, self.host, timeout=timeout)
+        self.mode = None
+        self.series = {}
+        self.threshold_events = deque(maxlen=1000)
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._updated = threading.Condition(self._lock)
+        self._thread = None
+        self._stream = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="thermal-telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._stream is not None:
+            self._stream.close()
+        if self._thread is not None:
+            self._thread.join(self.timeout)
+
+    def record(self, sensor, value, timestamp=None):
+        with self._lock:
+            if sensor not in self.series:
+                self.series[sensor] = SensorSeries(self.capacity)
+            self.series[sensor].append(timestamp or time.monotonic(), float(value))
+            self._updated.notify_all()
+
+    def sensors(self, prefix=""):
+        with self._lock:
+            return [sensor for sensor in self.series if sensor.rsplit("/", 1)[-1].startswith(prefix)]
+
+    def stats(self, sensor, window=None):
+        with self._lock:
+            series = self.series.get(sensor)
+            return series.stats(window) if series else None
+
+    def wait_for_samples(self, count=2, timeout=30):
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while not self.series or min(series.count for series in self.series.values()) < count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._updated.wait(remaining)
+        return True
+
+    def _run(self):
+        sse_uri = self._sse_uri() if self.use_sse else None
+        while sse_uri and not self._stop.is_set():
+            self.mode = "sse"
+            try:
+                self._listen(sse_uri)
+            except (requests.RequestException, ValueError):
+                self.errors += 1
+            if self.errors >= 3:
+                break
+        self.mode = "poll"
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll()
+            except (requests.RequestException, ValueError):
+                self.errors += 1
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _sse_uri(self):
+        try:
+            response = self.session.get(f"{self.host}{SERVICE_ROOT}/EventService", timeout=self.timeout)
+            if response.status_code == 200:
+                return response.json().get("ServerSentEventUri")
+        except (requests.RequestException, ValueError):
+            pass
+        return None
+
+    def _listen(self, sse_uri):
+        self._stream = self.session.get(
+            f"{self.host}{sse_uri}",
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(self.timeout, max(self.timeout, self.interval * SSE_SILENCE)),
+        )
+        connected = time.monotonic()
+        received = False
+        with self._stream as response:
+            if response.status_code != 200:
+                # сервис без SSE - сразу переходим к опросу
+                self.errors = 3
+                return
+            try:
+                for event in iter_events(response, keepalive=True):
+                    if self._stop.is_set():
+                        return
+                    if event is not None:
+                        received = self._handle_event(event) or received
+                    if not received and time.monotonic() - connected > self.interval * SSE_SILENCE:
+                        break
+            except requests.RequestException:
+                if received:
+                    raise
+            if not received and not self._stop.is_set():
+                # поток подключился, но показаний в нем нет (нет подписки на MetricReport) - переходим к опросу
+                self.errors = 3
+
+    def _handle_event(self, event):
+        """True, если из события записано хотя бы одно показание."""
+        recorded = False
+        for metric in event.get("MetricValues", []):
+            path = metric.get("MetricProperty", "").rsplit("/Reading", 1)[0]
+            try:
+                self.record(path, metric["MetricValue"])
+                recorded = True
+            except (KeyError, TypeError, ValueError):
+                continue
+        for entry in event.get("Events", []):
+            message_id = entry.get("MessageId", "")
+            if "Threshold" in message_id or "Sensor" in message_id:
+                self.threshold_events.append((time.monotonic(), entry))
+                origin = entry.get("OriginOfCondition", {})
+                path = origin.get("@odata.id") if isinstance(origin, dict) else origin
+                args = entry.get("MessageArgs", [])
+                if path and len(args) > 1:
+                    try:
+                        self.record(path, args[1])
+                        recorded = True
+                    except (TypeError, ValueError):
+                        pass
+        return recorded
+
+    def poll(self):
+        response = self.session.get(f"{self.host}{THERMAL_METRICS}", timeout=self.timeout)
+        if response.status_code == 200:
+            for reading in response.json().get("TemperatureReadingsCelsius", []):
+                if reading.get("Reading") is not None:
+                    self.record(reading["DataSourceUri"], reading["Reading"])
+            return
+        for sensor in self.query.members(SENSORS, ["Reading"]):
+            if sensor.get("Reading") is not None:
+                self.record(sensor["@odata.id"], sensor["Reading"])
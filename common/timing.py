@@ -0,0 +1,173 @@
+import re
+import socket
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# идентификаторы экземпляров, которые меняются от прогона к прогону
+TEMPLATE_PATTERNS = [
+    (re.compile(r"/Sessions/[^/]+"), "/Sessions/{id}"),
+    (re.compile(r"/Subscriptions/[^/]+"), "/Subscriptions/{id}"),
+    (re.compile(r"/Entries/[^/]+"), "/Entries/{id}"),
+]
+
+
+def endpoint_template(method, url):
+    path = urlsplit(url).path.rstrip("/") or "/"
+    for pattern, replacement in TEMPLATE_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return f"{method} {path}"
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * q / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+class TimedConnectionMixin:
+    """Замеряет DNS, TCP connect и TLS handshake при установке нового соединения."""
+
+    timings = None
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        host = self._dns_host
+        address = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        resolved = time.perf_counter()
+        # подключаемся к уже разрешенному адресу; SNI и проверка имени используют self.host
+        self._dns_host = address
+        try:
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+        self.timings = {"dns": resolved - started, "connect": time.perf_counter() - resolved}
+        return sock
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        timings = self.timings or {"dns": 0.0, "connect": 0.0}
+        timings["tls"] = max(0.0, time.perf_counter() - started - timings["dns"] - timings["connect"])
+        self.timings = timings
+
+    def pop_timings(self):
+        timings, self.timings = self.timings, None
+        return timings
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """HTTPAdapter, записывающий DNS/connect/TLS/TTFB/total и размер ответа каждого запроса в TimingRecorder."""
+
+    def __init__(self, recorder, **kwargs):
+        self.recorder = recorder
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, **kwargs):
+        # время отправки по часам, чтобы запись можно было воспроизвести с исходными интервалами (load_tests/OpenLoop.py)
+        timestamp = time.time()
+        started = time.perf_counter()
+        response = super().send(request, stream=stream, **kwargs)
+        ttfb = time.perf_counter() - started
+
+        connection = getattr(response.raw, "connection", None)
+        timings = connection.pop_timings() if isinstance(connection, TimedConnectionMixin) else None
+        if stream:
+            size = int(response.headers.get("Content-Length", 0))
+        else:
+            size = len(response.content)
+
+        self.recorder.record(
+            method=request.method,
+            url=request.url,
+            status=response.status_code,
+            reused=timings is None,
+            dns=timings["dns"] if timings else 0.0,
+            connect=timings["connect"] if timings else 0.0,
+            tls=timings.get("tls", 0.0) if timings else 0.0,
+            ttfb=ttfb,
+            total=time.perf_counter() - started,
+            bytes=size,
+            timestamp=timestamp,
+        )
+        return response
+
+
+class TimingRecorder:
+
+    PHASES = ["dns", "connect", "tls", "ttfb", "total"]
+
+    def __init__(self):
+        self.records = []
+        self.current_test = None
+        self._lock = threading.Lock()
+
+    def record(self, **fields):
+        fields["endpoint"] = endpoint_template(fields["method"], fields["url"])
+        fields["test"] = self.current_test
+        with self._lock:
+            self.records.append(fields)
+
+    def adapter(self, **kwargs):
+        return TimingAdapter(self, **kwargs)
+
+    def instrument(self, session):
+        adapter = self.adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def by_endpoint(self, records=None):
+        grouped = {}
+        for record in self.records if records is None else records:
+            grouped.setdefault(record["endpoint"], []).append(record)
+        return dict(sorted(grouped.items()))
+
+    def summary(self, records=None):
+        result = {}
+        for endpoint, records in self.by_endpoint(records).items():
+            stats = {"count": len(records), "errors": sum(1 for r in records if r["status"] >= 400)}
+            for phase in self.PHASES:
+                values = [r[phase] for r in records]
+                stats[phase] = {
+                    "mean": statistics.fmean(values),
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "p99": percentile(values, 99),
+                    "max": max(values),
+                }
+            stats["bytes"] = statistics.fmean(r["bytes"] for r in records)
+            result[endpoint] = stats
+        return result
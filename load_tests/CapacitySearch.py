@@ -0,0 +1,166 @@
+import json
+import os
+import sys
+
+from locust import LoadTestShape, events
+from locust.stats import calculate_response_time_percentile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# запросы и пул соединений FastOpenBMCUser; импорт модуля, а не классов, чтобы Locust не запустил их сами
+import FastLocust
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--slo-p99", type=float, default=500, help="Допустимый p99 на ступени, мс")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Допустимая доля ошибок на ступени")
+    parser.add_argument("--min-gain", type=float, default=0.05,
+                        help="Минимальный прирост RPS при удвоении пользователей; меньше - BMC насыщен")
+    parser.add_argument("--start-users", type=int, default=1, help="Число пользователей на первой ступени")
+    parser.add_argument("--max-users", type=int, default=1000, help="Верхняя граница поиска")
+    parser.add_argument("--step-time", type=float, default=20, help="Длительность ступени, с")
+    parser.add_argument("--warmup", type=float, default=5, help="Начало ступени, не входящее в замер, с")
+    parser.add_argument("--search-steps", type=int, default=12, help="Максимум ступеней бинарного поиска")
+    parser.add_argument("--capacity-json", default="capacity.json", help="Куда сохранить кривую и результат поиска")
+
+
+def snapshot(stats):
+    entries = {(entry.name, entry.method): entry for entry in stats.entries.values()}
+    entries[("Всего", "")] = stats.total
+    return {key: (entry.num_requests, entry.num_failures, dict(entry.response_times))
+            for key, entry in entries.items()}
+
+
+def window(before, after, seconds):
+    """RPS, доля ошибок и перцентили по каждому запросу между двумя снимками статистики."""
+    result = {}
+    for key, (requests, failures, times) in after.items():
+        requests_before, failures_before, times_before = before.get(key, (0, 0, {}))
+        count = requests - requests_before
+        if count <= 0:
+            continue
+        delta = {ms: n - times_before.get(ms, 0) for ms, n in times.items() if n > times_before.get(ms, 0)}
+        total = sum(delta.values())
+        result[key[0]] = {
+            "rps": count / seconds,
+            "error_rate": (failures - failures_before) / count,
+            "p50": calculate_response_time_percentile(delta, total, 0.5),
+            "p95": calculate_response_time_percentile(delta, total, 0.95),
+            "p99": calculate_response_time_percentile(delta, total, 0.99),
+        }
+    return result
+
+
+class CapacitySearchShape(LoadTestShape):
+    """Удваивает число пользователей до первой плохой ступени, затем бинарным поиском уточняет колено."""
+
+    def __init__(self):
+        super().__init__()
+        self.users = None
+        self.steps = []
+        self.best = None
+        self.bad_users = None
+        self.search_steps = 0
+        self.step_started = 0
+        self.measure_started = None
+        self.baseline = None
+
+    @property
+    def options(self):
+        return self.runner.environment.parsed_options
+
+    def start_step(self, users, now):
+        self.users = users
+        self.step_started = now
+        self.measure_started = None
+
+    def violations(self, total, users):
+        options = self.options
+        problems = []
+        if total["p99"] > options.slo_p99:
+            problems.append(f"p99 {total['p99']} мс > {options.slo_p99:.0f}")
+        if total["error_rate"] > options.max_error_rate:
+            problems.append(f"ошибок {total['error_rate']:.1%}")
+        if self.best is not None and users > self.best["users"]:
+            # удвоение пользователей должно дать хотя бы min_gain прироста, половина шага - половину и т. д.
+            required = self.best["total"]["rps"] * (1 + options.min_gain * (users / self.best["users"] - 1))
+            if total["rps"] < required:
+                problems.append(f"RPS {total['rps']:.1f} < {required:.1f}: насыщение")
+        return problems
+
+    def finish_step(self, now, aborted=False):
+        seconds = now - self.measure_started
+        endpoints = window(self.baseline, snapshot(self.runner.stats), seconds)
+        total = endpoints.pop("Всего", {"rps": 0, "error_rate": 1.0, "p50": 0, "p95": 0, "p99": 0})
+        problems = self.violations(total, self.users)
+        if aborted:
+            problems.append("ступень прервана досрочно")
+        step = {"users": self.users, "seconds": round(seconds, 1), "total": total, "endpoints": endpoints,
+                "good": not problems, "problems": problems}
+        self.steps.append(step)
+        print(f"Ступень {len(self.steps)}: {self.users} польз., {total['rps']:.1f} RPS, p99 {total['p99']} мс, "
+              f"ошибок {total['error_rate']:.2%} - {'норма' if step['good'] else '; '.join(problems)}")
+        if len(self.steps) == 1 and total["error_rate"] >= 1:
+            # все запросы первой ступени неудачны: BMC недоступен или неверны учетные данные, а не найден предел
+            print("ОШИБКА: на первой ступени все запросы завершились ошибкой, поиск предела прерван")
+            self.runner.environment.process_exit_code = 1
+            return None
+        if step["good"] and (self.best is None or total["rps"] >= self.best["total"]["rps"]):
+            self.best = step
+        elif not step["good"]:
+            self.bad_users = self.users if self.bad_users is None else min(self.bad_users, self.users)
+        return self.next_users()
+
+    def next_users(self):
+        options = self.options
+        good_users = self.best["users"] if self.best else 0
+        if self.bad_users is None:
+            if good_users >= options.max_users:
+                return None
+            return min(good_users * 2, options.max_users)
+        # бинарный поиск между последней хорошей и первой плохой ступенью до точности 10%
+        self.search_steps += 1
+        if self.bad_users - good_users <= max(1, good_users // 10) or self.search_steps > options.search_steps:
+            return None
+        return (good_users + self.bad_users) // 2 or None
+
+    def tick(self):
+        options = self.options
+        now = self.get_run_time()
+        if self.users is None:
+            self.start_step(options.start_users, now)
+        elapsed = now - self.step_started
+        if self.measure_started is None and elapsed >= options.warmup:
+            self.measure_started = now
+            self.baseline = snapshot(self.runner.stats)
+        if self.measure_started is not None and now - self.measure_started >= 2:
+            # не ждем конца ступени, если BMC уже явно перегружен: прекращаем раньше, чем он упадет
+            total = window(self.baseline, snapshot(self.runner.stats), now - self.measure_started).get("Всего")
+            overloaded = total and (total["p99"] > options.slo_p99 * 3 or total["error_rate"] > options.max_error_rate * 5)
+            if overloaded or elapsed >= options.step_time:
+                users = self.finish_step(now, aborted=bool(overloaded) and elapsed < options.step_time)
+                if users is None:
+                    self.report()
+                    return None
+                self.start_step(users, now)
+        return self.users, max(self.users, 10)
+
+    def report(self):
+        best = self.best
+        if best is None:
+            print("Поиск предела: ни одна ступень не уложилась в ограничения")
+        else:
+            print(f"Максимальная устойчивая нагрузка: {best['total']['rps']:.1f} RPS при {best['users']} польз., "
+                  f"p99 {best['total']['p99']} мс")
+            print(f"{'Запрос':<40} {'RPS':>8} {'p50, мс':>8} {'p99, мс':>8}")
+            for name, stats in sorted(best["endpoints"].items()):
+                print(f"{name:<40} {stats['rps']:>8.1f} {stats['p50']:>8} {stats['p99']:>8}")
+        if self.options.capacity_json:
+            with open(self.options.capacity_json, "w") as f:
+                json.dump({"max_sustainable": best, "curve": sorted(self.steps, key=lambda s: s["users"])}, f,
+                          indent=2, ensure_ascii=False)
+
+
+class CapacityUser(FastLocust.FastOpenBMCUser):
+    """FastOpenBMCUser без пауз: нагрузку задает только число пользователей на ступени."""
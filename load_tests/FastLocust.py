@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+
+from geventhttpclient.client import HTTPClientPool
+from locust import FastHttpUser, constant, events, task
+from locust.contrib.fasthttp import insecure_ssl_context_factory
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# общие с Locust.py пулы сессий Redfish, распределение по парку BMC и статистика по BMC;
+# импорт модуля, а не классов, чтобы Locust не запустил заодно OpenBMCUser
+import Locust
+from common.config import TIMEOUT
+from common.session import RedfishAuthError
+
+SENSORS = "/redfish/v1/Chassis/chassis/Sensors"
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--connections", type=int, default=20,
+                        help="Число keep-alive соединений с BMC на процесс Locust, общих для всех FastOpenBMCUser")
+
+
+@events.init.add_listener
+def create_client_pool(environment, **kwargs):
+    options = environment.parsed_options
+    FastRedfishUser.concurrency = options.connections if options else 20
+    # один пул соединений на процесс: пользователи не открывают свои TCP/TLS-соединения.
+    # insecure у FastHttpUser на свой client_pool не действует: самоподписанный сертификат BMC разрешается здесь
+    FastRedfishUser.client_pool = HTTPClientPool(concurrency=FastRedfishUser.concurrency, insecure=True,
+                                                 ssl_context_factory=insecure_ssl_context_factory)
+
+
+class FastRedfishUser(FastHttpUser):
+    """Пользователь на geventhttpclient: keep-alive соединения из общего пула и проверка ответа без разбора JSON.
+
+    Задач нет: запросы вызывают подклассы, а OpenLoop.py - по своему расписанию."""
+
+    abstract = True
+    host = "https://localhost:2443"
+    # без пауз: число пользователей задает число одновременных запросов к BMC
+    wait_time = constant(0)
+    insecure = True
+    network_timeout = TIMEOUT
+    connection_timeout = TIMEOUT
+
+    def on_start(self):
+        self.bmc = Locust.next_bmc(self.environment, self.host)
+        self.client.base_url = self.bmc
+        self.pool = None
+        try:
+            self.pool = Locust.get_session_pool(self.environment, self.bmc)
+            self.pooled = self.pool.acquire()
+        except RedfishAuthError as e:
+            print(f"Ошибка аутентификации: {e}")
+        self.sensors_url = SENSORS
+        response = self.client.get("/redfish/v1", name="Service Root")
+        if response.status_code == 200:
+            features = json.loads(response.content).get("ProtocolFeaturesSupported", {})
+            if features.get("ExpandQuery", {}).get("Levels"):
+                self.sensors_url = f"{SENSORS}?$expand=.($levels=1)"
+
+    def context(self):
+        return {"bmc": self.bmc}
+
+    def check(self, path, name, marker=None):
+        """True, если ответ прошел проверку; JSON не разбирается, достаточно кода ответа и ключа в теле."""
+        token = self.pooled.token if self.pool else None
+        with self.client.get(path, headers={"X-Auth-Token": token} if token else None, name=name,
+                             catch_response=True) as response:
+            if response.status_code == 401 and self.pool:
+                self.pool.renew(self.pooled, token)
+                response.failure("HTTP 401, сессия пересоздана")
+            elif response.status_code != 200:
+                response.failure(f"HTTP {response.status_code}")
+            elif marker is not None and marker not in response.content:
+                response.failure(f"В ответе нет {marker.decode()}")
+            else:
+                response.success()
+                return True
+        return False
+
+    def system_info(self):
+        return self.check("/redfish/v1/Systems/system", "Get System Info", b'"Status"')
+
+    def power_state(self):
+        return self.check("/redfish/v1/Systems/system", "Get Power State", b'"PowerState"')
+
+    def sensors(self):
+        return self.check(self.sensors_url, "Get Sensors", b'"Members"')
+
+
+class FastOpenBMCUser(FastRedfishUser):
+    """Закрытая модель: каждый пользователь отправляет следующий запрос сразу после ответа на предыдущий."""
+
+    @task(3)
+    def get_system_info(self):
+        self.system_info()
+
+    @task(2)
+    def get_power_state(self):
+        self.power_state()
+
+    @task(1)
+    def get_sensors(self):
+        self.sensors()
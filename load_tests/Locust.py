@@ -1,4 +1,118 @@
-from locust import HttpUser, task, between
+import csv
+import itertools
+import logging
+import os
+import sys
+import threading
+
+import requests
+from locust import HttpUser, task, between, events
+from locust.runners import WorkerRunner
+from locust.stats import RequestStats, StatsEntry
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from common.config import BMC_URLS, bmc_id
+from common.query import RedfishQuery
+from common.session import PooledAuth, RedfishAuthError, SessionPool
+
+# по одному пулу на каждый BMC парка
+SESSION_POOLS = {}
+SESSION_POOL_LOCK = threading.Lock()
+# статистика по каждому BMC; общая по парку - environment.stats
+FLEET_STATS = {}
+NEXT_BMC = itertools.count()
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--session-pool-size", type=int, default=4,
+                        help="Число сессий Redfish на процесс Locust, общих для всех пользователей")
+
+
+def get_session_pool(environment, host):
+    with SESSION_POOL_LOCK:
+        if host not in SESSION_POOLS:
+            options = environment.parsed_options
+            size = options.session_pool_size if options else 4
+            pool = SessionPool(size, base_url=f"{host.rstrip('/')}/redfish/v1")
+            pool.start()
+            SESSION_POOLS[host] = pool
+            print(f"Создано сессий Redfish на {bmc_id(host)}: {len(pool.tokens)}")
+    return SESSION_POOLS[host]
+
+
+@events.test_stop.add_listener
+def close_session_pool(environment, **kwargs):
+    with SESSION_POOL_LOCK:
+        for host, pool in SESSION_POOLS.items():
+            print(f"Удаление сессий Redfish на {bmc_id(host)}: {len(pool.tokens)}, переавторизаций: {pool.renewals}")
+            pool.close()
+        SESSION_POOLS.clear()
+
+
+def fleet_hosts(host):
+    # парк задается BMC_URLS (scripts/start_fleet.sh), без него нагрузка идет на --host
+    return BMC_URLS if "BMC_URLS" in os.environ else [host.rstrip("/")]
+
+
+def next_bmc(environment, host):
+    """BMC для нового пользователя: сквозной круг по всем worker, а не отдельный в каждом процессе.
+
+    Счетчик NEXT_BMC у каждого worker свой, поэтому k-й пользователь worker с номером i получает
+    номер i + k * LOCUST_WORKERS - иначе первые пользователи всех worker попали бы на первый BMC."""
+    hosts = fleet_hosts(host)
+    if isinstance(environment.runner, WorkerRunner):
+        workers, index = int(os.environ.get("LOCUST_WORKERS", 1)), max(environment.runner.worker_index, 0)
+    else:
+        workers, index = 1, 0
+    return hosts[(index + next(NEXT_BMC) * workers) % len(hosts)]
+
+
+@events.request.add_listener
+def record_bmc_request(request_type, name, response_time, response_length, exception=None, context=None,
+                       **kwargs):
+    bmc = (context or {}).get("bmc")
+    if bmc is None:
+        return
+    stats = FLEET_STATS.setdefault(bmc, RequestStats())
+    stats.log_request(request_type, name, response_time, response_length or 0)
+    if exception is not None:
+        stats.log_error(request_type, name, exception)
+
+
+@events.report_to_master.add_listener
+def report_bmc_stats(client_id, data):
+    data["bmc_stats"] = {bmc: stats.total.get_stripped_report() for bmc, stats in FLEET_STATS.items()}
+
+
+@events.worker_report.add_listener
+def merge_bmc_stats(client_id, data):
+    for bmc, entry in data.get("bmc_stats", {}).items():
+        FLEET_STATS.setdefault(bmc, RequestStats()).total.extend(StatsEntry.unserialize(entry))
+
+
+@events.quitting.add_listener
+def print_fleet_stats(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner) or len(FLEET_STATS) < 2:
+        return
+    rows = [(bmc_id(bmc), stats.total) for bmc, stats in sorted(FLEET_STATS.items())]
+    rows.append(("Парк целиком", environment.stats.total))
+    print(f"{'BMC':<30} {'Запросов':>9} {'Ошибок':>7} {'RPS':>8} {'p50, мс':>8} {'p95, мс':>8} {'p99, мс':>8}")
+    for name, entry in rows:
+        print(f"{name:<30} {entry.num_requests:>9} {entry.num_failures:>7} {entry.total_rps:>8.1f} "
+              f"{entry.get_response_time_percentile(0.5):>8.0f} {entry.get_response_time_percentile(0.95):>8.0f} "
+              f"{entry.get_response_time_percentile(0.99):>8.0f}")
+    csv_prefix = environment.parsed_options.csv_prefix if environment.parsed_options else None
+    if csv_prefix:
+        with open(f"{csv_prefix}_fleet.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["BMC", "Requests", "Failures", "RPS", "p50", "p95", "p99"])
+            for name, entry in rows:
+                writer.writerow([name, entry.num_requests, entry.num_failures, round(entry.total_rps, 2),
+                                 entry.get_response_time_percentile(0.5), entry.get_response_time_percentile(0.95),
+                                 entry.get_response_time_percentile(0.99)])
+
 
 class OpenBMCUser(HttpUser):
 
@@ -6,22 +120,18 @@ class OpenBMCUser(HttpUser):
     wait_time = between(2, 5)
 
     def on_start(self):
+        # пользователи распределяются по BMC парка по кругу; относительные пути идут на выбранный BMC
+        self.bmc = next_bmc(self.environment, self.host)
+        self.client.base_url = self.bmc
+        self.client.verify = False
+        self.query = RedfishQuery(self.client, host="")
+        try:
+            self.client.auth = PooledAuth(get_session_pool(self.environment, self.bmc))
+        except RedfishAuthError as e:
+            print(f"Ошибка аутентификации: {e}")
 
-        auth_response = self.client.post(
-            "/redfish/v1/SessionService/Sessions",
-            json={"UserName": "root", "Password": "0penBmc"},
-            verify=False
-        )
-
-        if auth_response.status_code in [200, 201]:
-            token = auth_response.headers.get("X-Auth-Token")
-            if token:
-                self.client.headers["X-Auth-Token"] = token
-                print(f"Успешная аутентификация, токен получен")
-            else:
-                print("Ошибка: токен не получен")
-        else:
-            print(f"Ошибка аутентификации: {auth_response.status_code}")
+    def context(self):
+        return {"bmc": self.bmc}
 
     @task(3)
     def get_system_info(self):
@@ -64,3 +174,11 @@ class OpenBMCUser(HttpUser):
                     response.failure("Невалидный JSON в ответе")
             else:
                 response.failure(f"HTTP {response.status_code}")
+
+    @task(1)
+    def get_sensors(self):
+        # время и ошибки HTTP-запросов считает статистика Locust; печать на каждом вызове тормозила бы нагрузку
+        try:
+            self.query.members("/redfish/v1/Chassis/chassis/Sensors", fields=["Reading"])
+        except (requests.RequestException, ValueError) as e:
+            logging.debug(f"Ошибка чтения датчиков: {e}")
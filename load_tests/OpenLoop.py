@@ -0,0 +1,253 @@
+import csv
+import json
+import os
+import random
+import sys
+import time
+from functools import partial
+from urllib.parse import urlsplit
+
+import gevent
+from gevent.queue import Queue
+from locust import LoadTestShape, events
+from locust.runners import MasterRunner, WorkerRunner
+from locust.stats import RequestStats, StatsEntry
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# запросы и пул соединений FastRedfishUser; импорт модуля, а не классов, чтобы Locust не запустил их сами
+import FastLocust
+
+# синтетическая смесь запросов в тех же пропорциях, что и задачи FastOpenBMCUser
+MIX = [
+    (3, "Get System Info", FastLocust.FastRedfishUser.system_info),
+    (2, "Get Power State", FastLocust.FastRedfishUser.power_state),
+    (1, "Get Sensors", FastLocust.FastRedfishUser.sensors),
+]
+
+# задержка относительно запланированного момента отправки, а не от фактической отправки
+INTENDED_STATS = RequestStats()
+SCHEDULER = None
+# запланировано и отправлено запросов этим процессом; на master - последние значения от каждого worker.
+# Отправленных больше запланированных - значит, пользователи шлют запросы мимо расписания (закрытая модель)
+COUNTS = {"scheduled": 0, "sent": 0}
+WORKER_COUNTS = {}
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--arrival", choices=["constant", "step", "poisson", "trace"], default="constant",
+                        help="Поток запросов: постоянный, ступенчатый, пуассоновский или запись трассы")
+    parser.add_argument("--arrival-rate", type=float, default=10,
+                        help="Интенсивность запросов в секунду на весь тест (начальная для step)")
+    parser.add_argument("--rate-step", type=float, default=10, help="Прирост интенсивности на каждой ступени")
+    parser.add_argument("--step-duration", type=float, default=30, help="Длительность ступени, с")
+    parser.add_argument("--arrival-duration", type=float, default=60, help="Длительность теста, с")
+    parser.add_argument("--max-in-flight", type=int, default=50,
+                        help="Число пользователей, то есть предел одновременных запросов")
+    parser.add_argument("--trace", default="redfish_timings.json",
+                        help="JSON с записями запросов (--timings-json из redfish_api_tests) для --arrival trace")
+    parser.add_argument("--trace-speed", type=float, default=1.0, help="Ускорение воспроизведения трассы")
+
+
+def replay(user, path, name):
+    return user.check(path, name)
+
+
+def load_trace(path, speed=1.0):
+    """(смещение от начала, имя, действие) для GET-запросов из --timings-json."""
+    with open(path) as f:
+        records = json.load(f)["records"]
+    # запросы с изменяемыми ID (сессии) и запросы, меняющие состояние BMC, не воспроизводятся
+    records = sorted((r for r in records if r["method"] == "GET" and "{id}" not in r["endpoint"] and "timestamp" in r),
+                     key=lambda r: r["timestamp"])
+    if not records:
+        return []
+    started = records[0]["timestamp"]
+    trace = []
+    for record in records:
+        url = urlsplit(record["url"])
+        path = f"{url.path}?{url.query}" if url.query else url.path
+        name = record["endpoint"].split(" ", 1)[1]
+        trace.append(((record["timestamp"] - started) / speed, name, partial(replay, path=path, name=name)))
+    return trace
+
+
+class ArrivalSchedule:
+    """Моменты отправки запросов этого процесса, не зависящие от времени ответа BMC."""
+
+    def __init__(self, options, share=1, index=0):
+        self.mode = options.arrival
+        self.rate = options.arrival_rate
+        self.rate_step = options.rate_step
+        self.step_duration = options.step_duration
+        self.duration = options.arrival_duration
+        # worker делят общую интенсивность и трассу поровну
+        self.share = share
+        self.index = index
+        self.trace = load_trace(options.trace, options.trace_speed) if self.mode == "trace" else None
+        if self.trace is not None:
+            self.duration = self.trace[-1][0] if self.trace else 0
+
+    def rate_at(self, offset):
+        if self.mode == "step":
+            return self.rate + self.rate_step * int(offset // self.step_duration)
+        return self.rate
+
+    def arrivals(self):
+        if self.trace is not None:
+            yield from self.trace[self.index::self.share]
+            return
+        offset = 0.0
+        weights = [weight for weight, _, _ in MIX]
+        while offset < self.duration:
+            rate = self.rate_at(offset) / self.share
+            if rate <= 0:
+                # при нулевой интенсивности запросов нет: ступенчатый поток ждет следующей ступени, остальные кончаются
+                if self.mode != "step":
+                    return
+                offset = (offset // self.step_duration + 1) * self.step_duration
+                continue
+            _, name, action = random.choices(MIX, weights)[0]
+            yield offset, name, action
+            offset += random.expovariate(rate) if self.mode == "poisson" else 1 / rate
+
+
+class Scheduler:
+    """Выдает пользователям моменты отправки; если все заняты, запрос ждет в очереди и это входит в задержку."""
+
+    def __init__(self, schedule, backlog):
+        self.schedule = schedule
+        self.queue = Queue()
+        # дальше очередь не растет: запрос считается потерянным, чтобы при зависшем BMC не копить память
+        self.backlog = backlog
+        self._greenlet = None
+
+    def start(self):
+        self._greenlet = gevent.spawn(self.run)
+        return self
+
+    def stop(self):
+        if self._greenlet is not None:
+            self._greenlet.kill(block=False)
+
+    def run(self):
+        started = time.monotonic()
+        for offset, name, action in self.schedule.arrivals():
+            delay = started + offset - time.monotonic()
+            if delay > 0:
+                gevent.sleep(delay)
+            if self.queue.qsize() >= self.backlog:
+                INTENDED_STATS.log_error("GET", name, "Очередь запросов переполнена")
+                continue
+            COUNTS["scheduled"] += 1
+            self.queue.put((started + offset, name, action))
+
+
+@events.test_start.add_listener
+def start_scheduler(environment, **kwargs):
+    global SCHEDULER
+
+    if isinstance(environment.runner, MasterRunner):
+        return
+    options = environment.parsed_options
+    if isinstance(environment.runner, WorkerRunner):
+        share, index = int(os.environ.get("LOCUST_WORKERS", 1)), max(environment.runner.worker_index, 0)
+    else:
+        share, index = 1, 0
+    SCHEDULER = Scheduler(ArrivalSchedule(options, share, index), backlog=options.max_in_flight * 10).start()
+
+
+@events.test_stop.add_listener
+def stop_scheduler(environment, **kwargs):
+    if SCHEDULER is not None:
+        SCHEDULER.stop()
+
+
+@events.request.add_listener
+def count_sent(name, **kwargs):
+    # Service Root запрашивается один раз в on_start, вне расписания
+    if name != "Service Root":
+        COUNTS["sent"] += 1
+
+
+@events.report_to_master.add_listener
+def report_intended_stats(client_id, data):
+    data["intended_stats"] = [entry.get_stripped_report() for entry in INTENDED_STATS.entries.values()]
+    data["intended_total"] = INTENDED_STATS.total.get_stripped_report()
+    data["open_loop_counts"] = dict(COUNTS)
+
+
+@events.worker_report.add_listener
+def merge_intended_stats(client_id, data):
+    if "open_loop_counts" in data:
+        WORKER_COUNTS[client_id] = data["open_loop_counts"]
+    for entry in data.get("intended_stats", []):
+        INTENDED_STATS.get(entry["name"], entry["method"]).extend(StatsEntry.unserialize(entry))
+    if "intended_total" in data:
+        INTENDED_STATS.total.extend(StatsEntry.unserialize(data["intended_total"]))
+
+
+@events.quitting.add_listener
+def check_open_loop(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner):
+        return
+    counts = list(WORKER_COUNTS.values()) or [COUNTS]
+    scheduled = sum(c["scheduled"] for c in counts)
+    sent = sum(c["sent"] for c in counts)
+    if sent > scheduled:
+        print(f"ОШИБКА: отправлено {sent} запросов при {scheduled} запланированных - нагрузка не открытая")
+        environment.process_exit_code = 1
+
+
+@events.quitting.add_listener
+def print_intended_stats(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner) or not (INTENDED_STATS.total.num_requests or INTENDED_STATS.total.num_failures):
+        return
+    rows = [(entry.name, entry) for entry in sorted(INTENDED_STATS.entries.values(), key=lambda e: e.name)]
+    rows.append(("Всего", INTENDED_STATS.total))
+    print("Задержка от запланированного момента отправки (открытая модель нагрузки), мс:")
+    print(f"{'Запрос':<50} {'Запросов':>9} {'Ошибок':>9} {'p50':>7} {'p95':>7} {'p99':>7} {'p99 ответа':>11}")
+    table = []
+    for name, entry in rows:
+        service = environment.stats.total if entry is INTENDED_STATS.total else environment.stats.get(name, "GET")
+        row = [name, entry.num_requests, entry.num_failures, entry.get_response_time_percentile(0.5),
+               entry.get_response_time_percentile(0.95), entry.get_response_time_percentile(0.99),
+               service.get_response_time_percentile(0.99)]
+        table.append(row)
+        print(f"{row[0]:<50} {row[1]:>9} {row[2]:>9} {row[3]:>7.0f} {row[4]:>7.0f} {row[5]:>7.0f} {row[6]:>11.0f}")
+    csv_prefix = environment.parsed_options.csv_prefix if environment.parsed_options else None
+    if csv_prefix:
+        with open(f"{csv_prefix}_intended.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Name", "Requests", "Failures", "p50", "p95", "p99", "Service p99"])
+            writer.writerows(table)
+
+
+class OpenLoopUser(FastLocust.FastRedfishUser):
+    """Пользователь открытой модели: берет из очереди запланированный запрос, а не решает сам, когда его отправить."""
+
+    def dispatch(self):
+        intended, name, action = SCHEDULER.queue.get()
+        if action(self):
+            INTENDED_STATS.log_request("GET", name, (time.monotonic() - intended) * 1000, 0)
+        else:
+            # неудачный ответ - не задержка, а ошибка: быстрый отказ BMC не должен улучшать перцентили
+            INTENDED_STATS.log_error("GET", name, "Запрос завершился ошибкой")
+
+    tasks = [dispatch]
+
+
+class ArrivalRateShape(LoadTestShape):
+    """Держит --max-in-flight пользователей на время расписания; интенсивность задает Scheduler, а не число пользователей."""
+
+    duration = None
+
+    def tick(self):
+        options = self.runner.environment.parsed_options
+        if self.duration is None:
+            self.duration = ArrivalSchedule(options).duration
+        # запас, чтобы ответы на последние запросы успели прийти
+        if self.get_run_time() > self.duration + 5:
+            return None
+        return options.max_in_flight, options.max_in_flight
@@ -0,0 +1,339 @@
+import csv
+import os
+import random
+import sys
+
+import requests
+from locust import HttpUser, between, events, tag, task
+from locust.runners import MasterRunner, WorkerRunner
+from locust.stats import RequestStats, StatsEntry
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# общие пулы сессий, распределение по парку BMC и статистика по BMC;
+# импорт модуля, а не классов, чтобы Locust не запустил заодно OpenBMCUser
+import Locust
+from common.config import PASSWORD, TIMEOUT, USERNAME, bmc_id
+from common.session import PooledAuth, RedfishAuthError, close_session, create_session
+
+SESSIONS = "/redfish/v1/SessionService/Sessions"
+
+# настройки, которые пишет SettingsWriterUser: путь -> свойства; после записи значение всегда возвращается
+SETTINGS = {
+    "/redfish/v1/Systems/system": ["AssetTag", "LocationIndicatorActive"],
+    "/redfish/v1/SessionService": ["SessionTimeout"],
+}
+
+# исходные значения настроек по BMC: снимаются один раз до старта пользователей, на master рассылаются worker
+ORIGINALS = {}
+# статистика по сценариям (классам пользователей); общая по всем запросам - environment.stats
+SCENARIO_STATS = {}
+
+
+def temporary_value(name, original):
+    """Значение для записи, отличное от исходного и допустимое для bmcweb."""
+    if isinstance(original, bool):
+        return not original
+    if isinstance(original, int):
+        # SessionTimeout в bmcweb: 30..86400 секунд
+        return original + 60 if original + 60 <= 86400 else original - 60
+    return "locust-write" if original != "locust-write" else "locust-write-2"
+
+
+def read_originals(host):
+    session = create_session(f"{host}/redfish/v1")
+    try:
+        originals = {}
+        for path, names in SETTINGS.items():
+            response = session.get(f"{host}{path}", timeout=TIMEOUT)
+            if response.status_code != 200:
+                continue
+            resource = response.json()
+            values = {name: resource[name] for name in names if name in resource}
+            if values:
+                originals[path] = values
+        return originals
+    finally:
+        close_session(session)
+
+
+def restore_originals(host, originals):
+    session = create_session(f"{host}/redfish/v1")
+    try:
+        for path, values in originals.items():
+            response = session.patch(f"{host}{path}", json=values, timeout=TIMEOUT)
+            if response.status_code not in (200, 204):
+                print(f"Не удалось вернуть {path} на {bmc_id(host)}: HTTP {response.status_code}")
+    finally:
+        close_session(session)
+
+
+@events.init.add_listener
+def select_scenarios(environment, runner=None, **kwargs):
+    # -T/-E Locust фильтрует задачи, но класс без задач остается и падает при запуске: убираем его сами.
+    # worker получает теги от master позже, при запуске теста, и классы ему назначает master
+    if isinstance(runner, WorkerRunner):
+        runner.register_message("scenario_originals", receive_originals)
+        return
+    options = environment.parsed_options
+    tags = set(options.tags) if options and options.tags else None
+    exclude = set(options.exclude_tags) if options and options.exclude_tags else None
+    if tags is None and exclude is None:
+        return
+
+    def selected(task_function):
+        task_tags = getattr(task_function, "locust_tag_set", set())
+        return (tags is None or task_tags & tags) and not (exclude and task_tags & exclude)
+
+    environment.user_classes[:] = [user_class for user_class in environment.user_classes
+                                   if any(selected(t) for t in user_class.tasks)]
+    print("Сценарии: " + (", ".join(u.scenario for u in environment.user_classes) or "ни один не выбран тегами"))
+
+
+def receive_originals(environment, msg, **kwargs):
+    ORIGINALS.update(msg.data)
+
+
+@events.test_start.add_listener
+def save_originals(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner) or SettingsWriterUser not in environment.user_classes:
+        return
+    for host in Locust.fleet_hosts(environment.host or SettingsWriterUser.host):
+        try:
+            ORIGINALS[host] = read_originals(host)
+        except (RedfishAuthError, requests.RequestException) as e:
+            print(f"Не удалось прочитать настройки {bmc_id(host)}, запись отключена: {e}")
+            ORIGINALS[host] = {}
+    if isinstance(environment.runner, MasterRunner):
+        # сообщение уходит раньше команды на запуск пользователей
+        environment.runner.send_message("scenario_originals", ORIGINALS)
+
+
+@events.test_stop.add_listener
+def restore_settings(environment, **kwargs):
+    # пользователь мог быть остановлен между записью и возвратом значения
+    if not SettingsWriterUser.written:
+        return
+    for host in SettingsWriterUser.written:
+        try:
+            restore_originals(host, ORIGINALS.get(host, {}))
+        except (RedfishAuthError, requests.RequestException) as e:
+            print(f"Не удалось вернуть настройки {bmc_id(host)}: {e}")
+    SettingsWriterUser.written.clear()
+
+
+@events.request.add_listener
+def record_scenario_request(request_type, name, response_time, response_length, exception=None, context=None,
+                            **kwargs):
+    scenario = (context or {}).get("scenario")
+    if scenario is None:
+        return
+    stats = SCENARIO_STATS.setdefault(scenario, RequestStats())
+    stats.log_request(request_type, name, response_time, response_length or 0)
+    if exception is not None:
+        stats.log_error(request_type, name, exception)
+
+
+@events.report_to_master.add_listener
+def report_scenario_stats(client_id, data):
+    data["scenario_stats"] = {
+        scenario: {"entries": [entry.get_stripped_report() for entry in stats.entries.values()],
+                   "total": stats.total.get_stripped_report()}
+        for scenario, stats in SCENARIO_STATS.items()
+    }
+
+
+@events.worker_report.add_listener
+def merge_scenario_stats(client_id, data):
+    for scenario, report in data.get("scenario_stats", {}).items():
+        stats = SCENARIO_STATS.setdefault(scenario, RequestStats())
+        for entry in report["entries"]:
+            stats.get(entry["name"], entry["method"]).extend(StatsEntry.unserialize(entry))
+        stats.total.extend(StatsEntry.unserialize(report["total"]))
+
+
+@events.quitting.add_listener
+def print_scenario_stats(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner) or not SCENARIO_STATS:
+        return
+    rows = []
+    for scenario, stats in sorted(SCENARIO_STATS.items()):
+        for entry in sorted(stats.entries.values(), key=lambda e: (e.name, e.method)):
+            rows.append((scenario, f"{entry.method} {entry.name}", entry))
+        rows.append((scenario, "Всего по сценарию", stats.total))
+    print("Задержка по сценариям:")
+    print(f"{'Сценарий':<8} {'Запрос':<45} {'Запросов':>9} {'Ошибок':>7} {'RPS':>7} "
+          f"{'p50, мс':>8} {'p95, мс':>8} {'p99, мс':>8}")
+    for scenario, name, entry in rows:
+        print(f"{scenario:<8} {name:<45} {entry.num_requests:>9} {entry.num_failures:>7} {entry.total_rps:>7.1f} "
+              f"{entry.get_response_time_percentile(0.5):>8.0f} {entry.get_response_time_percentile(0.95):>8.0f} "
+              f"{entry.get_response_time_percentile(0.99):>8.0f}")
+    csv_prefix = environment.parsed_options.csv_prefix if environment.parsed_options else None
+    if csv_prefix:
+        with open(f"{csv_prefix}_scenarios.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Scenario", "Name", "Requests", "Failures", "RPS", "p50", "p95", "p99"])
+            for scenario, name, entry in rows:
+                writer.writerow([scenario, name, entry.num_requests, entry.num_failures, round(entry.total_rps, 2),
+                                 entry.get_response_time_percentile(0.5), entry.get_response_time_percentile(0.95),
+                                 entry.get_response_time_percentile(0.99)])
+
+
+class ScenarioUser(HttpUser):
+    """Общая часть сценариев: выбор BMC парка и проверка ответа; scenario попадает в статистику по сценариям."""
+
+    abstract = True
+    host = "https://localhost:2443"
+    scenario = None
+    # сценарию нужны токены из общего пула SessionPool
+    pooled_auth = True
+
+    def on_start(self):
+        self.bmc = Locust.next_bmc(self.environment, self.host)
+        self.client.base_url = self.bmc
+        self.client.verify = False
+        if self.pooled_auth:
+            try:
+                self.client.auth = PooledAuth(Locust.get_session_pool(self.environment, self.bmc))
+            except RedfishAuthError as e:
+                print(f"Ошибка аутентификации: {e}")
+
+    def context(self):
+        return {"bmc": self.bmc, "scenario": self.scenario}
+
+    def call(self, method, path, name, expected=(200,), key=None, **kwargs):
+        """Запрос с проверкой кода ответа и, если задан key, наличия ключа в JSON.
+
+        Возвращает JSON ответа ({} без key) или None, если проверка не прошла."""
+        with self.client.request(method, path, name=name, catch_response=True, **kwargs) as response:
+            if response.status_code not in expected:
+                response.failure(f"HTTP {response.status_code}")
+                return None
+            if key is None:
+                response.success()
+                return {}
+            try:
+                data = response.json()
+            except ValueError:
+                response.failure("Невалидный JSON в ответе")
+                return None
+            if key not in data:
+                response.failure(f"{key} отсутствует в ответе")
+                return None
+            response.success()
+            return data
+
+
+class SessionChurnUser(ScenarioUser):
+    """Создание и удаление сессий: вход, одно чтение под новым токеном и выход, как у скриптов мониторинга."""
+
+    weight = 2
+    scenario = "churn"
+    pooled_auth = False
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        super().on_start()
+        self.session_url = None
+
+    def on_stop(self):
+        # сессия, оставшаяся от прерванной задачи, занимала бы лимит сессий BMC
+        if self.session_url:
+            self.logout()
+
+    def logout(self):
+        self.call("DELETE", self.session_url, "Session Logout", expected=(200, 204),
+                  headers={"X-Auth-Token": self.token})
+        self.session_url = None
+
+    @tag("churn")
+    @task
+    def churn(self):
+        with self.client.post(SESSIONS, json={"UserName": USERNAME, "Password": PASSWORD},
+                              name="Session Login", catch_response=True) as response:
+            if response.status_code not in (200, 201) or "X-Auth-Token" not in response.headers:
+                # 503 - BMC исчерпал лимит одновременных сессий
+                response.failure(f"HTTP {response.status_code}")
+                return
+            response.success()
+            self.token = response.headers["X-Auth-Token"]
+            self.session_url = response.headers.get("Location") or f"{SESSIONS}/{response.json().get('Id', '')}"
+        self.call("GET", "/redfish/v1/Systems/system", "Session Read", key="PowerState",
+                  headers={"X-Auth-Token": self.token})
+        self.logout()
+
+
+class SensorPollerUser(ScenarioUser):
+    """Опрос датчиков, как у систем мониторинга: Chassis, ThermalSubSystem/ThermalMetrics и Sensors."""
+
+    weight = 6
+    scenario = "poll"
+    wait_time = between(1, 2)
+
+    def on_start(self):
+        super().on_start()
+        self.chassis = []
+        self.thermal_metrics = []
+        self.sensors = []
+        collection = self.call("GET", "/redfish/v1/Chassis", "Discover Chassis Collection", key="Members")
+        for member in (collection or {}).get("Members", []):
+            chassis = self.call("GET", member["@odata.id"], "Discover Chassis", key="Id")
+            if chassis is None:
+                continue
+            self.chassis.append(member["@odata.id"])
+            if "Sensors" in chassis:
+                self.sensors.append(chassis["Sensors"]["@odata.id"])
+            if "ThermalSubSystem" in chassis:
+                thermal = self.call("GET", chassis["ThermalSubSystem"]["@odata.id"], "Discover ThermalSubSystem",
+                                    key="Id")
+                if thermal and "ThermalMetrics" in thermal:
+                    self.thermal_metrics.append(thermal["ThermalMetrics"]["@odata.id"])
+        root = self.call("GET", "/redfish/v1", "Service Root", key="Id") or {}
+        # $expand отдает все показания одним запросом; без него опрашивается только коллекция
+        self.expand = root.get("ProtocolFeaturesSupported", {}).get("ExpandQuery", {}).get("Levels", False)
+
+    @tag("poll")
+    @task(2)
+    def poll_sensors(self):
+        if self.sensors:
+            params = {"$expand": ".($levels=1)"} if self.expand else None
+            self.call("GET", random.choice(self.sensors), "Poll Sensors", key="Members", params=params)
+
+    @tag("poll")
+    @task(1)
+    def poll_thermal_metrics(self):
+        if self.thermal_metrics:
+            self.call("GET", random.choice(self.thermal_metrics), "Poll ThermalMetrics",
+                      key="TemperatureReadingsCelsius")
+
+    @tag("poll")
+    @task(1)
+    def poll_chassis(self):
+        if self.chassis:
+            self.call("GET", random.choice(self.chassis), "Poll Chassis", key="PowerState")
+
+
+class SettingsWriterUser(ScenarioUser):
+    """Запись настроек PATCH с возвратом исходного значения: после каждого цикла BMC в прежнем состоянии."""
+
+    weight = 1
+    scenario = "write"
+    wait_time = between(2, 5)
+    # BMC, на которые этот процесс писал: их настройки возвращаются при остановке теста
+    written = set()
+
+    @tag("write")
+    @task
+    def write_setting(self):
+        originals = ORIGINALS.get(self.bmc)
+        if not originals:
+            return
+        path = random.choice(list(originals))
+        name = random.choice(list(originals[path]))
+        original = originals[path][name]
+        SettingsWriterUser.written.add(self.bmc)
+        if self.call("PATCH", path, f"Patch {name}", expected=(200, 204),
+                     json={name: temporary_value(name, original)}) is not None:
+            # чтение сразу после записи: насколько запись задерживает GET того же ресурса
+            self.call("GET", path, "Read After Patch", key=name)
+        self.call("PATCH", path, f"Restore {name}", expected=(200, 204), json={name: original})
@@ -1,54 +1,64 @@
+import json
+import os
+
 import pytest
 import requests
-import urllib3
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from common.cache import CachingSession
+from common.config import BMC_URLS, TIMEOUT, bmc_id
+from common.power import BENCHMARK_RESET_TYPES, PHASES, ResetBenchmark, print_summary, summarize
+from common.query import RedfishQuery
+from common.session import PooledAuth, RedfishAuthError
+from common.telemetry import ThermalTelemetry
 
-BASE_URL = "https://localhost:2443/redfish/v1"
-USERNAME = "root"
-PASSWORD = "0penBmc"
-TIMEOUT = 30
+MAX_TEMPERATURE_RATE = 10
 
-AUTH_TOKEN = None
 
 @pytest.fixture(scope="session")
-def auth_session():
-    global AUTH_TOKEN
-
-    session = requests.Session()
+def auth_session(session_pool, timing_recorder, schema_validator):
+    session = timing_recorder.instrument(CachingSession())
     session.verify = False
+    if schema_validator is not None:
+        session.hooks["response"].append(schema_validator.submit)
+    try:
+        session.auth = PooledAuth(session_pool)
+    except RedfishAuthError as e:
+        pytest.exit(str(e))
 
-    response = session.post(
-        f"{BASE_URL}/SessionService/Sessions",
-        json={"UserName": USERNAME, "Password": PASSWORD},
-        timeout=TIMEOUT
-    )
+    yield session
 
-    if response.status_code == 201:
-        AUTH_TOKEN = response.headers['X-Auth-Token']
-        session.headers['X-Auth-Token'] = AUTH_TOKEN
-    else:
-        pytest.exit(f"Не удалось создать сессию: {response.status_code}")
+    print(f"Кэш Redfish: {session.hits} попаданий, {session.misses} промахов")
+    session.close()
 
-    yield session
 
-    try:
-        session.delete(f"{BASE_URL}/SessionService/Sessions/{response.json().get('Id', '')}", timeout=TIMEOUT)
-    except:
-        pass
+@pytest.fixture(scope="session")
+def redfish_query(bmc, auth_session):
+    return RedfishQuery(auth_session, host=bmc)
+
+
+@pytest.fixture(scope="session")
+def thermal_telemetry(bmc, session_pool):
+    session = requests.Session()
+    session.verify = False
+    session.auth = PooledAuth(session_pool)
+    telemetry = ThermalTelemetry(session, host=bmc).start()
+
+    yield telemetry
+
+    telemetry.stop()
     session.close()
 
 
 @pytest.fixture
-def system_info(auth_session):
-    response = auth_session.get(f"{BASE_URL}/Systems/system", timeout=TIMEOUT)
+def system_info(auth_session, base_url):
+    response = auth_session.get(f"{base_url}/Systems/system", timeout=TIMEOUT)
     return response.json()
 
 
 class TestRedfishAPI:
 
-    def test_01_authentication(self, auth_session):
-        response = auth_session.get(f"{BASE_URL}/", timeout=TIMEOUT)
+    def test_01_authentication(self, auth_session, base_url):
+        response = auth_session.get(f"{base_url}/", timeout=TIMEOUT)
         assert response.status_code == 200
 
     def test_02_system_info(self, auth_session, system_info):
@@ -56,19 +66,19 @@ class TestRedfishAPI:
         for field in required_fields:
             assert field in system_info
 
-    def test_03_power_management(self, auth_session, system_info):
+    def test_03_power_management(self, auth_session, base_url, system_info):
         if "Actions" not in system_info or "#ComputerSystem.Reset" not in system_info["Actions"]:
             pytest.skip("Действие Reset недоступно")
         for reset_type in ["GracefulRestart", "ForceRestart"]:
             resp = auth_session.post(
-                f"{BASE_URL}/Systems/system/Actions/ComputerSystem.Reset",
+                f"{base_url}/Systems/system/Actions/ComputerSystem.Reset",
                 json={"ResetType": reset_type},
                 timeout=TIMEOUT
             )
             assert resp.status_code in [200, 202, 204, 400]
 
-    def test_04_cpu_temperature(self, auth_session):
-        thermal_url = f"{BASE_URL}/Chassis/chassis/ThermalSubSystem"
+    def test_04_cpu_temperature(self, auth_session, base_url):
+        thermal_url = f"{base_url}/Chassis/chassis/ThermalSubSystem"
         resp = auth_session.get(thermal_url, timeout=TIMEOUT)
         if resp.status_code != 200:
             pytest.skip("Thermal endpoint недоступен")
@@ -87,10 +97,84 @@ class TestRedfishAPI:
                     assert temp <= upper_fatal
                 assert -20 <= temp <= 120
 
-    def test_05_cpu_sensors_consistency(self, auth_session):
-        resp = auth_session.get(f"{BASE_URL}/Systems/system", timeout=TIMEOUT)
+    def test_05_cpu_sensors_consistency(self, auth_session, base_url):
+        resp = auth_session.get(f"{base_url}/Systems/system", timeout=TIMEOUT)
         assert resp.status_code == 200
 
-    def test_06_session_management(self, auth_session):
-        resp = auth_session.get(f"{BASE_URL}/SessionService", timeout=TIMEOUT)
+    def test_06_session_management(self, auth_session, base_url):
+        resp = auth_session.get(f"{base_url}/SessionService", timeout=TIMEOUT)
         assert resp.status_code == 200
+
+    def test_07_resource_tree(self, redfish_resource, inventory_conformance):
+        assert redfish_resource.error is None, redfish_resource.error
+        assert redfish_resource.status_code == 200
+        assert redfish_resource.data.get("@odata.id", "").rstrip("/") == redfish_resource.path
+        assert "@odata.type" in redfish_resource.data
+        assert inventory_conformance.get(redfish_resource.path) is None, inventory_conformance[redfish_resource.path]
+
+    def test_08_sensor_readings(self, redfish_query):
+        sensors = redfish_query.members("/redfish/v1/Chassis/chassis/Sensors",
+                                        fields=["ReadingType", "Reading", "Thresholds"])
+        if not sensors:
+            pytest.skip("Датчики не найдены")
+        for sensor in sensors:
+            reading = sensor.get("Reading")
+            if reading is None or sensor.get("ReadingType") != "Temperature":
+                continue
+            for threshold in ["UpperCritical", "UpperFatal"]:
+                limit = sensor.get("Thresholds", {}).get(threshold, {}).get("Reading")
+                if limit:
+                    assert reading <= limit
+            assert -20 <= reading <= 120
+
+    def test_09_thermal_telemetry(self, thermal_telemetry):
+        if not thermal_telemetry.wait_for_samples(2, timeout=30):
+            pytest.skip("Нет показаний датчиков температуры")
+        sensors = thermal_telemetry.sensors(prefix="temperature")
+        if not sensors:
+            pytest.skip("Температурные датчики не найдены")
+        for sensor in sensors:
+            stats = thermal_telemetry.stats(sensor, window=300)
+            assert -20 <= stats["min"] <= stats["max"] <= 120
+            assert stats["max_rate"] <= MAX_TEMPERATURE_RATE
+
+    def test_10_reset_benchmark(self, pytestconfig, bmc, session_pool, system_info, record_property):
+        cycles = pytestconfig.getoption("--reset-cycles")
+        if not cycles:
+            pytest.skip("Бенчмарк Reset не запрошен (--reset-cycles N)")
+        reset_action = system_info.get("Actions", {}).get("#ComputerSystem.Reset", {})
+        allowed = reset_action.get("ResetType@Redfish.AllowableValues", BENCHMARK_RESET_TYPES)
+        reset_types = [reset_type for reset_type in BENCHMARK_RESET_TYPES if reset_type in allowed]
+
+        session = requests.Session()
+        session.verify = False
+        session.auth = PooledAuth(session_pool)
+        benchmark = ResetBenchmark(session, host=bmc)
+        try:
+            results = benchmark.run(reset_types, cycles)
+        finally:
+            benchmark.close()
+            session.close()
+
+        summary = summarize(results)
+        print_summary(summary)
+        for reset_type, phases in summary.items():
+            for phase, stats in phases.items():
+                record_property(f"{reset_type}.{phase}.p50", round(stats["p50"], 3))
+                record_property(f"{reset_type}.{phase}.p99", round(stats["p99"], 3))
+        path = pytestconfig.getoption("--reset-json")
+        if path:
+            if len(BMC_URLS) > 1:
+                # BMC парка проверяются параллельно: у каждого свой файл
+                root, ext = os.path.splitext(path)
+                path = f"{root}-{bmc_id(bmc).replace(':', '_')}{ext}"
+            with open(path, "w") as f:
+                json.dump({"bmc": bmc, "cycles": results, "summary": summary}, f, indent=2)
+
+        for result in results:
+            missing = [phase for phase in PHASES if result[phase] is None]
+            if result["reset_type"] in ["ForceOff", "GracefulShutdown"]:
+                missing = [phase for phase in missing if phase == "time_to_off"]
+            elif result["reset_type"] in ["On", "ForceOn"]:
+                missing = [phase for phase in missing if phase != "time_to_off"]
+            assert not missing, f"{result['reset_type']}: не дождались {', '.join(missing)}"
@@ -0,0 +1,202 @@
+import dataclasses
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from common.config import BMC_URLS, bmc_id
+from common.crawler import RedfishCrawler, RedfishResource
+from common.schema import SchemaValidator
+from common.session import PooledAuth, SessionPool
+
+pytest_plugins = ["timing_plugin"]
+
+# по одному на каждый BMC парка
+INVENTORIES = None
+POOLS = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("redfish")
+    group.addoption("--no-crawl", action="store_true", default=False,
+                    help="не обходить дерево Redfish при сборе тестов")
+    group.addoption("--crawl-concurrency", type=int, default=16,
+                    help="число параллельных запросов при обходе дерева Redfish")
+    group.addoption("--reset-cycles", type=int, default=0, metavar="N",
+                    help="выполнить бенчмарк ComputerSystem.Reset: N циклов каждого ResetType")
+    group.addoption("--reset-json", default="reset_benchmark.json",
+                    help="куда сохранить результаты бенчмарка Reset в JSON")
+    group.addoption("--no-schema", action="store_true", default=False,
+                    help="не проверять ответы по схемам DMTF Redfish")
+    group.addoption("--schema-workers", type=int, default=None,
+                    help="число процессов для проверки схем (по умолчанию - число ядер)")
+    group.addoption("--session-pool-size", type=int, default=1,
+                    help="число сессий Redfish, создаваемых на весь прогон")
+
+
+def get_session_pool(config, bmc):
+    if bmc not in POOLS:
+        POOLS[bmc] = SessionPool(config.getoption("--session-pool-size"), base_url=f"{bmc}/redfish/v1")
+    return POOLS[bmc]
+
+
+def pytest_unconfigure(config):
+    for pool in POOLS.values():
+        pool.close()
+
+
+@pytest.fixture(scope="session")
+def session_pools(pytestconfig):
+    return partial(get_session_pool, pytestconfig)
+
+
+@pytest.fixture(scope="session")
+def session_pool(bmc, session_pools):
+    return session_pools(bmc)
+
+
+@pytest.fixture(scope="session")
+def base_url(bmc):
+    return f"{bmc}/redfish/v1"
+
+
+@pytest.fixture(scope="session")
+def schema_validator(pytestconfig):
+    if pytestconfig.getoption("--no-schema"):
+        yield None
+        return
+    validator = SchemaValidator(workers=pytestconfig.getoption("--schema-workers"))
+    if not validator.available:
+        # предупреждение попадает в сводку pytest, а не теряется в захваченном выводе фикстуры
+        warnings.warn(f"Схемы Redfish не найдены в {validator.schema_dir}, проверка схем отключена "
+                      f"(scripts/fetch_redfish_schemas.sh)")
+        validator.close()
+        yield None
+        return
+
+    yield validator
+
+    if validator.skipped:
+        warnings.warn(f"Без проверки схемы (нет локальной схемы): {len(validator.skipped)} ресурсов")
+    validator.close()
+
+
+@pytest.fixture(autouse=True)
+def schema_conformance(request, schema_validator):
+    if schema_validator is None:
+        yield
+        return
+    schema_validator.current_test = request.node.nodeid
+
+    yield
+
+    errors = schema_validator.collect(request.node.nodeid)
+    schema_validator.current_test = None
+    if errors:
+        pytest.fail("Ответы не соответствуют схеме Redfish:\n" + "\n".join(errors))
+
+
+@pytest.fixture(scope="session")
+def inventory_conformance(pytestconfig, bmc, schema_validator):
+    if schema_validator is None:
+        return {}
+    inventory = get_inventories(pytestconfig)[bmc]
+    return schema_validator.validate_many(
+        {path: resource.data for path, resource in inventory.items() if "@odata.type" in resource.data})
+
+
+@pytest.fixture
+def redfish_resource(pytestconfig, bmc, redfish_path):
+    resource = get_inventories(pytestconfig)[bmc].get(redfish_path)
+    if resource is None:
+        pytest.skip(f"Ресурс {redfish_path} отсутствует на {bmc_id(bmc)}")
+    return resource
+
+
+def crawl(config, bmc):
+    from timing_plugin import RECORDER
+
+    session = RECORDER.instrument(requests.Session())
+    session.verify = False
+    try:
+        session.auth = PooledAuth(get_session_pool(config, bmc))
+    except Exception as e:
+        print(f"Обход дерева Redfish на {bmc_id(bmc)} пропущен: {e}")
+        return {}
+    try:
+        started = time.perf_counter()
+        crawler = RedfishCrawler(session, bmc, concurrency=config.getoption("--crawl-concurrency"))
+        inventory = crawler.crawl()
+        print(f"Обход дерева Redfish на {bmc_id(bmc)}: {len(inventory)} ресурсов "
+              f"за {time.perf_counter() - started:.2f} с")
+    finally:
+        session.close()
+    return inventory
+
+
+def get_inventories(config):
+    global INVENTORIES
+    from timing_plugin import RECORDER
+
+    if INVENTORIES is not None:
+        return INVENTORIES
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and "redfish_inventories" in workerinput:
+        # процесс xdist: дерево уже обошел главный процесс (pytest_configure_node)
+        INVENTORIES = {bmc: {path: RedfishResource(**resource) for path, resource in inventory.items()}
+                       for bmc, inventory in workerinput["redfish_inventories"].items()}
+        return INVENTORIES
+    if config.getoption("--no-crawl"):
+        INVENTORIES = {bmc: {} for bmc in BMC_URLS}
+        return INVENTORIES
+
+    RECORDER.current_test = "crawl"
+    try:
+        with ThreadPoolExecutor(max_workers=len(BMC_URLS)) as executor:
+            INVENTORIES = dict(zip(BMC_URLS, executor.map(partial(crawl, config), BMC_URLS)))
+    finally:
+        RECORDER.current_test = None
+    return INVENTORIES
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    inventories = get_inventories(node.config)
+    node.workerinput["redfish_inventories"] = {
+        bmc: {path: dataclasses.asdict(resource) for path, resource in inventory.items()}
+        for bmc, inventory in inventories.items()
+    }
+
+
+def pytest_generate_tests(metafunc):
+    if "bmc" in metafunc.fixturenames:
+        metafunc.parametrize("bmc", BMC_URLS, ids=[bmc_id(bmc) for bmc in BMC_URLS], scope="session")
+    if "redfish_path" in metafunc.fixturenames:
+        # одна прошивка на весь парк: пути объединяются, отсутствующий на конкретном BMC ресурс пропускается
+        paths = sorted({path for inventory in get_inventories(metafunc.config).values() for path in inventory})
+        metafunc.parametrize("redfish_path", paths)
+
+
+def item_bmc(item):
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("bmc") if callspec is not None else None
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    # тесты одного BMC подряд, чтобы сессионные фикстуры (кэш, телеметрия) не пересоздавались при смене BMC
+    items.sort(key=lambda item: BMC_URLS.index(item_bmc(item)) if item_bmc(item) in BMC_URLS else -1)
+    # с --dist loadgroup каждый BMC целиком уходит в свой процесс xdist: BMC проверяются параллельно,
+    # а тесты одного BMC (Reset, сессии) идут последовательно
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        if item_bmc(item) is not None:
+            item.add_marker(pytest.mark.xdist_group(bmc_id(item_bmc(item))))
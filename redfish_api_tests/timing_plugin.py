@@ -0,0 +1,179 @@
+import glob
+import html
+import json
+import os
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from common.config import TIMEOUT, bmc_id
+from common.session import PooledAuth
+from common.timing import TimingRecorder
+
+RECORDER = TimingRecorder()
+BENCHMARK_RECORDER = TimingRecorder()
+BENCHMARK = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("redfish")
+    group.addoption("--timings-json", default="redfish_timings.json",
+                    help="куда сохранить времена запросов Redfish в JSON")
+    group.addoption("--benchmark", type=int, default=0, metavar="N",
+                    help="после тестов повторить каждый GET-эндпоинт N раз и вывести p50/p95/p99")
+
+
+@pytest.fixture(scope="session")
+def timing_recorder():
+    return RECORDER
+
+
+@pytest.fixture(scope="session", autouse=True)
+def endpoint_benchmark(request):
+    repeat = request.config.getoption("--benchmark")
+    pools = request.getfixturevalue("session_pools") if repeat > 0 else None
+    yield
+    if pools is not None:
+        run_benchmark(pools, repeat)
+
+
+def run_benchmark(pools, repeat):
+    global BENCHMARK
+
+    recorder = BENCHMARK_RECORDER
+    recorder.current_test = "benchmark"
+    for bmc, records in by_bmc(RECORDER.records).items():
+        urls = sorted({r["url"] for r in records if r["method"] == "GET" and r["status"] == 200})
+        session = recorder.instrument(requests.Session())
+        session.verify = False
+        session.auth = PooledAuth(pools(bmc))
+        try:
+            for url in urls:
+                for _ in range(repeat):
+                    session.get(url, timeout=TIMEOUT)
+        finally:
+            session.close()
+    BENCHMARK = recorder.summary()
+
+
+def by_bmc(records):
+    result = {}
+    for record in records:
+        url = urlsplit(record["url"])
+        result.setdefault(f"{url.scheme}://{url.netloc}", []).append(record)
+    return result
+
+
+def worker_id():
+    return os.environ.get("PYTEST_XDIST_WORKER")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    RECORDER.current_test = item.nodeid
+    yield
+    RECORDER.current_test = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "teardown" or not item.config.pluginmanager.hasplugin("html"):
+        return
+    records = [r for r in RECORDER.records if r["test"] == item.nodeid]
+    if records:
+        import pytest_html
+        extras = getattr(report, "extras", [])
+        extras.append(pytest_html.extras.html(render_html(RECORDER.summary(records))))
+        report.extras = extras
+
+
+def ms(value):
+    return f"{value * 1000:.1f}"
+
+
+def render_html(summary, title="Времена запросов Redfish, мс"):
+    rows = []
+    for endpoint, stats in summary.items():
+        rows.append(
+            f"<tr><td>{html.escape(endpoint)}</td><td>{stats['count']}</td><td>{stats['errors']}</td>"
+            f"<td>{ms(stats['dns']['mean'])}</td><td>{ms(stats['connect']['mean'])}</td>"
+            f"<td>{ms(stats['tls']['mean'])}</td><td>{ms(stats['ttfb']['p50'])}</td>"
+            f"<td>{ms(stats['total']['p50'])}</td><td>{ms(stats['total']['p95'])}</td>"
+            f"<td>{ms(stats['total']['p99'])}</td><td>{stats['bytes']:.0f}</td></tr>"
+        )
+    return (
+        f"<h3>{title}</h3><table><tr><th>Эндпоинт</th><th>Запросов</th><th>Ошибок</th><th>DNS</th>"
+        f"<th>Connect</th><th>TLS</th><th>TTFB p50</th><th>p50</th><th>p95</th><th>p99</th><th>Байт</th></tr>"
+        + "".join(rows) + "</table>"
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    if RECORDER.records:
+        postfix.append(render_html(RECORDER.summary()))
+        fleet = by_bmc(RECORDER.records)
+        if len(fleet) > 1:
+            for bmc, records in fleet.items():
+                postfix.append(render_html(RECORDER.summary(records), f"Времена запросов Redfish, {bmc_id(bmc)}, мс"))
+    if BENCHMARK:
+        repeat = session.config.getoption("--benchmark")
+        postfix.append(render_html(BENCHMARK, f"Бенчмарк: {repeat} повторов на эндпоинт, мс"))
+
+
+def pytest_sessionfinish(session):
+    global BENCHMARK
+
+    path = session.config.getoption("--timings-json")
+    if not path:
+        return
+    if worker_id():
+        # процесс xdist сохраняет свою часть, объединяет главный процесс
+        with open(f"{path}.{worker_id()}", "w") as f:
+            json.dump({"records": RECORDER.records, "benchmark": BENCHMARK_RECORDER.records}, f)
+        return
+    parts = sorted(glob.glob(f"{path}.gw*"))
+    for part in parts:
+        with open(part) as f:
+            data = json.load(f)
+        RECORDER.records.extend(data["records"])
+        BENCHMARK_RECORDER.records.extend(data["benchmark"])
+        os.remove(part)
+    if parts and BENCHMARK_RECORDER.records:
+        BENCHMARK = BENCHMARK_RECORDER.summary()
+    if not RECORDER.records:
+        return
+    with open(path, "w") as f:
+        json.dump({
+            "endpoints": RECORDER.summary(),
+            "bmcs": {bmc_id(bmc): RECORDER.summary(records) for bmc, records in by_bmc(RECORDER.records).items()},
+            "benchmark": BENCHMARK,
+            "benchmark_repeat": session.config.getoption("--benchmark"),
+            "records": RECORDER.records,
+        }, f, indent=2, ensure_ascii=False)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    summary = BENCHMARK or RECORDER.summary()
+    if not summary:
+        return
+    title = f"Бенчмарк Redfish ({config.getoption('--benchmark')} повторов)" if BENCHMARK else "Времена запросов Redfish"
+    terminalreporter.section(title)
+    write_table(terminalreporter, summary)
+    fleet = by_bmc(RECORDER.records)
+    if len(fleet) > 1:
+        for bmc, records in fleet.items():
+            terminalreporter.section(f"Времена запросов Redfish, {bmc_id(bmc)}", sep="-")
+            write_table(terminalreporter, RECORDER.summary(records))
+
+
+def write_table(terminalreporter, summary):
+    terminalreporter.write_line(f"{'Эндпоинт':<70} {'N':>5} {'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9}")
+    for endpoint, stats in summary.items():
+        total = stats["total"]
+        terminalreporter.write_line(
+            f"{endpoint:<70} {stats['count']:>5} {ms(total['p50']):>9} {ms(total['p95']):>9} {ms(total['p99']):>9}"
+        )
@@ -0,0 +1,28 @@
+#!/bin/bash
+
+set -e
+
+echo "=== Загрузка схем DMTF Redfish ==="
+
+BUNDLE="${REDFISH_SCHEMA_BUNDLE:-DSP8010_2023.3}"
+SCHEMA_DIR="${REDFISH_SCHEMA_DIR:-$(dirname "$0")/../schemas/redfish}"
+
+# версия набора записывается рядом со схемами: при смене REDFISH_SCHEMA_BUNDLE набор загружается заново
+if [ "$(cat "$SCHEMA_DIR/.bundle" 2>/dev/null)" = "$BUNDLE" ] && ls "$SCHEMA_DIR"/*.json > /dev/null 2>&1; then
+    echo "Схемы $BUNDLE уже загружены: $SCHEMA_DIR"
+    exit 0
+fi
+
+TMP_DIR=$(mktemp -d)
+trap 'rm -rf "$TMP_DIR"' EXIT
+
+echo "Скачивание $BUNDLE.zip..."
+curl -sSfL -o "$TMP_DIR/$BUNDLE.zip" "https://www.dmtf.org/sites/default/files/standards/documents/$BUNDLE.zip"
+
+rm -f "${SCHEMA_DIR:?}"/*.json
+mkdir -p "$SCHEMA_DIR"
+unzip -q -j -o "$TMP_DIR/$BUNDLE.zip" "*/json-schema/*.json" -d "$SCHEMA_DIR" \
+    || unzip -q -j -o "$TMP_DIR/$BUNDLE.zip" "json-schema/*.json" -d "$SCHEMA_DIR"
+
+echo "$BUNDLE" > "$SCHEMA_DIR/.bundle"
+echo "Схемы сохранены в $SCHEMA_DIR: $(ls "$SCHEMA_DIR" | wc -l) файлов"
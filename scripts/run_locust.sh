@@ -0,0 +1,35 @@
+#!/bin/bash
+
+# Запуск Locust в режиме master/worker: по одному worker на ядро, чтобы упираться в BMC, а не в генератор нагрузки
+# Использование: run_locust.sh <locustfile> [аргументы master: --host, --users, --headless, --csv ...]
+
+if [ -z "$1" ]; then
+    echo "Использование: $0 <locustfile> [аргументы locust]"
+    exit 1
+fi
+
+LOCUSTFILE="$1"
+shift
+LOCUST_WORKERS="${LOCUST_WORKERS:-$(nproc)}"
+LOCUST_MASTER_PORT="${LOCUST_MASTER_PORT:-5557}"
+
+echo "=== Locust: master и $LOCUST_WORKERS worker ($LOCUSTFILE) ==="
+
+WORKER_PIDS=()
+for ((i = 0; i < LOCUST_WORKERS; i++)); do
+    # LOCUST_WORKERS нужен worker, чтобы делить между собой общую интенсивность (OpenLoop.py)
+    LOCUST_WORKERS=$LOCUST_WORKERS locust -f "$LOCUSTFILE" --worker --master-port "$LOCUST_MASTER_PORT" > "/tmp/locust-worker-$i.log" 2>&1 &
+    WORKER_PIDS+=($!)
+done
+
+stop_workers() {
+    kill "${WORKER_PIDS[@]}" 2>/dev/null
+    wait "${WORKER_PIDS[@]}" 2>/dev/null
+}
+trap stop_workers EXIT
+
+# пользовательские опции (--session-pool-size, --connections) master передает worker сам
+locust -f "$LOCUSTFILE" --master \
+    --master-bind-port "$LOCUST_MASTER_PORT" \
+    --expect-workers "$LOCUST_WORKERS" \
+    "$@"
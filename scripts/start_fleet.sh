@@ -0,0 +1,74 @@
+#!/bin/bash
+
+# Запуск парка из N BMC: каждый QEMU со своими портами, PID, логом и снимком (scripts/start_qemu.sh с BMC_INDEX)
+# Использование: start_fleet.sh [N]
+
+FLEET_SIZE="${1:-${FLEET_SIZE:-1}}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+FLEET_ENV="/tmp/qemu-fleet.env"
+FIRST_HTTPS_PORT="${FIRST_HTTPS_PORT:-2443}"
+FIRST_HTTP_PORT="${FIRST_HTTP_PORT:-8081}"
+
+echo "=== Запуск парка OpenBMC: $FLEET_SIZE экземпляров ==="
+
+# первый свободный порт, начиная с $1
+free_port() {
+    python3 - "$1" << 'PYEOF'
+import socket
+import sys
+
+port = int(sys.argv[1])
+while True:
+    with socket.socket() as sock:
+        try:
+            sock.bind(("", port))
+            break
+        except OSError:
+            port += 1
+print(port)
+PYEOF
+}
+
+HTTPS_PORTS=()
+PIDS=()
+NEXT_HTTPS_PORT=$FIRST_HTTPS_PORT
+NEXT_HTTP_PORT=$FIRST_HTTP_PORT
+
+for ((i = 0; i < FLEET_SIZE; i++)); do
+    HTTPS_PORT=$(free_port "$NEXT_HTTPS_PORT")
+    HTTP_PORT=$(free_port "$NEXT_HTTP_PORT")
+    NEXT_HTTPS_PORT=$((HTTPS_PORT + 1))
+    NEXT_HTTP_PORT=$((HTTP_PORT + 1))
+    HTTPS_PORTS+=("$HTTPS_PORT")
+
+    echo "BMC $i: https://localhost:$HTTPS_PORT (лог /tmp/qemu-fleet-$i.out)"
+    BMC_INDEX=$i HTTPS_PORT=$HTTPS_PORT HTTP_PORT=$HTTP_PORT \
+        "$SCRIPT_DIR/start_qemu.sh" > "/tmp/qemu-fleet-$i.out" 2>&1 &
+    PIDS+=($!)
+done
+
+READY=()
+for ((i = 0; i < FLEET_SIZE; i++)); do
+    if wait "${PIDS[$i]}"; then
+        READY+=("https://localhost:${HTTPS_PORTS[$i]}")
+        echo "BMC $i готов: https://localhost:${HTTPS_PORTS[$i]}"
+    else
+        echo "ОШИБКА: BMC $i не запустился, см. /tmp/qemu-fleet-$i.out"
+        tail -n 20 "/tmp/qemu-fleet-$i.out"
+    fi
+done
+
+if [ ${#READY[@]} -eq 0 ]; then
+    echo "ОШИБКА: ни один BMC парка не запустился"
+    exit 1
+fi
+
+# адреса готовых BMC для тестов: source /tmp/qemu-fleet.env
+BMC_URLS=$(IFS=,; echo "${READY[*]}")
+{
+    echo "export BMC_URL=${READY[0]}"
+    echo "export BMC_URLS=$BMC_URLS"
+    echo "export FLEET_SIZE=${#READY[@]}"
+} > "$FLEET_ENV"
+
+echo "Парк запущен: ${#READY[@]} из $FLEET_SIZE BMC, адреса в $FLEET_ENV"
@@ -4,50 +4,151 @@ set -e
 
 echo "=== Запуск QEMU с OpenBMC ==="
 
+REPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
 cd /var/jenkins_home/workspace/romulus
 
-if [ ! -f "obmc-phosphor-image-romulus-20250902012112.static.mtd" ]; then
+MTD_IMAGE="obmc-phosphor-image-romulus-20250902012112.static.mtd"
+
+if [ ! -f "$MTD_IMAGE" ]; then
     echo "ОШИБКА: MTD файл не найден!"
     exit 1
 fi
 
-echo "MTD файл найден: obmc-phosphor-image-romulus-20250902012112.static.mtd"
+echo "MTD файл найден: $MTD_IMAGE"
+
+# Номер экземпляра в парке (scripts/start_fleet.sh): у нулевого прежние порты и файлы,
+# у остальных порты задает start_fleet.sh, а к именам файлов добавляется номер
+BMC_INDEX="${BMC_INDEX:-0}"
+HTTPS_PORT="${HTTPS_PORT:-2443}"
+HTTP_PORT="${HTTP_PORT:-8081}"
+if [ "$BMC_INDEX" = "0" ]; then
+    SUFFIX=""
+else
+    SUFFIX="-$BMC_INDEX"
+fi
+BMC_ADDRESS="https://localhost:$HTTPS_PORT"
+
+QEMU_LOG="/tmp/qemu${SUFFIX}.log"
+QEMU_PID_FILE="/tmp/qemu${SUFFIX}.pid"
+QEMU_MONITOR="/tmp/qemu-monitor${SUFFIX}.sock"
+BOOT_TIMEOUT="${BOOT_TIMEOUT:-300}"
+BOOT_PHASES_JSON="${BOOT_PHASES_JSON:-/tmp/boot_phases${SUFFIX}.json}"
+
+# Быстрый старт: образ подключается через qcow2-оверлей, после первой загрузки
+# состояние машины сохраняется (savevm) и следующие запуски восстанавливают его (loadvm)
+FAST_BOOT="${FAST_BOOT:-1}"
+SNAPSHOT_DIR="${SNAPSHOT_DIR:-/var/jenkins_home/workspace/romulus/snapshots}"
+SNAPSHOT_NAME="bmc-ready"
+OVERLAY="$SNAPSHOT_DIR/${MTD_IMAGE%.mtd}${SUFFIX}.qcow2"
+# восстановленная машина должна ответить быстро, иначе снимок считается испорченным
+RESTORE_TIMEOUT="${RESTORE_TIMEOUT:-60}"
+
+start_qemu() {
+    if [ "$FAST_BOOT" = "1" ]; then
+        DRIVE="file=$OVERLAY,format=qcow2,if=mtd"
+    elif [ "$BMC_INDEX" = "0" ]; then
+        DRIVE="file=$MTD_IMAGE,format=raw,if=mtd"
+    else
+        # экземпляры парка не пишут в общий образ: изменения живут во временном файле QEMU
+        DRIVE="file=$MTD_IMAGE,format=raw,if=mtd,snapshot=on"
+    fi
+
+    rm -f "$QEMU_MONITOR"
+    QEMU_STARTED_AT=$(date +%s.%N)
+    nohup qemu-system-arm \
+        -M romulus-bmc \
+        -nographic \
+        -drive "$DRIVE" \
+        -netdev user,id=net0,hostfwd=tcp::$HTTPS_PORT-:443,hostfwd=tcp::$HTTP_PORT-:80 \
+        -device pcnet,netdev=net0 \
+        -bios /usr/share/qemu-efi-aarch64/QEMU_EFI.fd \
+        -monitor unix:"$QEMU_MONITOR",server,nowait \
+        "$@" \
+        >> "$QEMU_LOG" 2>&1 &
+
+    QEMU_PID=$!
+    echo "QEMU запущен с PID: $QEMU_PID"
+    echo "$QEMU_PID" > "$QEMU_PID_FILE"
+}
+
+stop_started_qemu() {
+    kill -TERM "$QEMU_PID" 2>/dev/null || true
+    wait "$QEMU_PID" 2>/dev/null || true
+}
+
+wait_ready() {
+    PYTHONPATH="$REPO_DIR" BMC_URL="$BMC_ADDRESS" python3 -m common.readiness \
+        --started-at "$QEMU_STARTED_AT" \
+        --timeout "$1" \
+        --json "$BOOT_PHASES_JSON"
+}
 
-QEMU_LOG="/tmp/qemu.log"
+# команда HMP-монитору QEMU; ответ читается до следующего приглашения "(qemu)"
+monitor() {
+    python3 - "$QEMU_MONITOR" "$1" << 'EOF'
+import socket
+import sys
 
-echo "Запуск QEMU..."
-nohup qemu-system-arm \
-    -M romulus-bmc \
-    -nographic \
-    -drive file=obmc-phosphor-image-romulus-20250902012112.static.mtd,format=raw,if=mtd \
-    -netdev user,id=net0,hostfwd=tcp::2443-:443,hostfwd=tcp::8081-:80 \
-    -device pcnet,netdev=net0 \
-    -bios /usr/share/qemu-efi-aarch64/QEMU_EFI.fd \
-    > "$QEMU_LOG" 2>&1 &
+sock = socket.socket(socket.AF_UNIX)
+sock.connect(sys.argv[1])
+sock.settimeout(600)
 
-QEMU_PID=$!
-echo "QEMU запущен с PID: $QEMU_PID"
+def read_prompt():
+    data = b""
+    while not data.endswith(b"(qemu) "):
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode(errors="replace")
 
-echo "$QEMU_PID" > /tmp/qemu.pid
+read_prompt()
+sock.sendall(sys.argv[2].encode() + b"\n")
+print(read_prompt().replace("(qemu) ", "").strip())
+EOF
+}
 
-echo "Ожидание запуска OpenBMC..."
-MAX_WAIT=30
-WAIT_TIME=0
-INTERVAL=10
+: > "$QEMU_LOG"
 
-while [ $WAIT_TIME -lt $MAX_WAIT ]; do
-    if curl -k -s https://localhost:2443 > /dev/null 2>&1; then
-        echo "OpenBMC успешно запущен и доступен на https://localhost:2443"
-        echo "QEMU PID: $QEMU_PID"
+if [ "$FAST_BOOT" = "1" ] && [ -f "$OVERLAY" ] && qemu-img snapshot -l -U "$OVERLAY" | grep -q "$SNAPSHOT_NAME"; then
+    echo "Восстановление OpenBMC из снимка $SNAPSHOT_NAME..."
+    start_qemu -loadvm "$SNAPSHOT_NAME"
+    if wait_ready "$RESTORE_TIMEOUT"; then
+        echo "OpenBMC восстановлен из снимка и доступен на $BMC_ADDRESS"
         exit 0
     fi
-    
-    echo "Ожидание... ($WAIT_TIME/$MAX_WAIT секунд)"
-    sleep $INTERVAL
-    WAIT_TIME=$((WAIT_TIME + INTERVAL))
-done
-
-echo "ОШИБКА: OpenBMC не запустился в течение $MAX_WAIT секунд"
-echo "Логи QEMU:"
-cat "$QEMU_LOG"
-exit 1
+    echo "Снимок не поднялся за $RESTORE_TIMEOUT секунд, удаляем его и загружаемся с нуля"
+    stop_started_qemu
+    rm -f "$OVERLAY"
+fi
+
+if [ "$FAST_BOOT" = "1" ]; then
+    mkdir -p "$SNAPSHOT_DIR"
+    rm -f "$OVERLAY"
+    # оверлей ссылается на исходный образ по абсолютному пути, сам образ не меняется
+    qemu-img create -f qcow2 -b "$(pwd)/$MTD_IMAGE" -F raw "$OVERLAY" > /dev/null
+fi
+
+echo "Холодная загрузка QEMU..."
+start_qemu
+
+echo "Ожидание готовности Redfish..."
+if ! wait_ready "$BOOT_TIMEOUT"; then
+    echo "ОШИБКА: OpenBMC не запустился в течение $BOOT_TIMEOUT секунд"
+    echo "Логи QEMU:"
+    cat "$QEMU_LOG"
+    exit 1
+fi
+
+echo "OpenBMC успешно запущен и доступен на $BMC_ADDRESS"
+echo "QEMU PID: $QEMU_PID"
+
+if [ "$FAST_BOOT" = "1" ]; then
+    echo "Сохранение снимка $SNAPSHOT_NAME для следующих запусков..."
+    if monitor "savevm $SNAPSHOT_NAME" && qemu-img snapshot -l -U "$OVERLAY" | grep -q "$SNAPSHOT_NAME"; then
+        echo "Снимок сохранен в $OVERLAY"
+    else
+        echo "Не удалось сохранить снимок, следующий запуск снова будет холодным"
+    fi
+fi
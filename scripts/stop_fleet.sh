@@ -0,0 +1,20 @@
+#!/bin/bash
+
+# Остановка всех QEMU парка, запущенных scripts/start_fleet.sh
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
+echo "=== Остановка парка OpenBMC ==="
+
+for PID_FILE in /tmp/qemu-[0-9]*.pid; do
+    [ -f "$PID_FILE" ] || continue
+    BMC_INDEX=$(basename "$PID_FILE" .pid)
+    BMC_INDEX="${BMC_INDEX#qemu-}"
+    BMC_INDEX=$BMC_INDEX "$SCRIPT_DIR/stop_qemu.sh"
+done
+
+if [ -f /tmp/qemu.pid ]; then
+    BMC_INDEX=0 "$SCRIPT_DIR/stop_qemu.sh"
+fi
+
+rm -f /tmp/qemu-fleet.env
@@ -2,7 +2,15 @@
 
 echo "=== Остановка QEMU ==="
 
-PID_FILE="/tmp/qemu.pid"
+# BMC_INDEX - номер экземпляра парка (scripts/start_fleet.sh), по умолчанию одиночный QEMU
+BMC_INDEX="${BMC_INDEX:-0}"
+if [ "$BMC_INDEX" = "0" ]; then
+    SUFFIX=""
+else
+    SUFFIX="-$BMC_INDEX"
+fi
+
+PID_FILE="/tmp/qemu${SUFFIX}.pid"
 
 if [ -f "$PID_FILE" ]; then
     QEMU_PID=$(cat "$PID_FILE")
@@ -25,9 +33,13 @@ if [ -f "$PID_FILE" ]; then
     fi
     
     rm -f "$PID_FILE"
-else
+elif [ "$BMC_INDEX" = "0" ]; then
     echo "PID файл не найден, поиск процессов QEMU..."
     pkill -f "qemu-system-arm" || echo "Процессы QEMU не найдены"
+else
+    echo "PID файл $PID_FILE не найден"
 fi
 
+rm -f "/tmp/qemu-monitor${SUFFIX}.sock"
+
 echo "Очистка завершена"
@@ -1,11 +1,23 @@
 import pytest
+import requests
 import time
+import sys
+import urllib3
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 import os
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from common.config import BMC_URL, USERNAME, PASSWORD, TIMEOUT
+from perf import PageMetricsRecorder
+
+pytest_plugins = ["perf_plugin"]
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 @pytest.fixture(scope="session")
 def driver():
     chrome_options = Options()
@@ -54,9 +66,59 @@ def driver():
         print(f"Ошибка при создании WebDriver: {e}")
         driver = webdriver.Chrome(options=chrome_options)
     
-    driver.implicitly_wait(10)
+    # без неявного ожидания: страницы ждут явных условий (pages.py), find_elements не должен висеть 10 с
+    driver.implicitly_wait(0)
     driver.set_page_load_timeout(30)
+    # метрики загрузки страниц снимают page objects при open()/login()
+    driver.perf_recorder = PageMetricsRecorder(driver)
     
     yield driver
     
+    # импорт здесь, а не в начале файла: модуль плагина загружает pytest через pytest_plugins
+    from perf_plugin import PAGES
+    PAGES.extend(driver.perf_recorder.pages)
     driver.quit()
+
+
+def webui_login(base_url=BMC_URL, username=USERNAME, password=PASSWORD):
+    # тот же запрос, что отправляет форма логина webui: в ответ приходят cookie SESSION и XSRF-TOKEN
+    session = requests.Session()
+    session.verify = False
+    response = session.post(f"{base_url}/login", json={"username": username, "password": password}, timeout=TIMEOUT)
+    if not response.ok:
+        session.close()
+    response.raise_for_status()
+    return session
+
+
+def webui_logout(session, base_url=BMC_URL):
+    # bmcweb требует X-XSRF-TOKEN для POST с cookie-сессией; сессия могла уже закончиться в браузере
+    try:
+        session.post(f"{base_url}/logout", json={}, headers={"X-XSRF-TOKEN": session.cookies.get("XSRF-TOKEN", "")},
+                     timeout=TIMEOUT)
+    except requests.RequestException:
+        pass
+    session.close()
+
+
+@pytest.fixture
+def logged_in_driver(driver):
+    session = webui_login()
+    # cookie можно добавить только для открытого домена; /redfish/v1 - самая легкая страница BMC
+    driver.get(f"{BMC_URL}/redfish/v1")
+    for cookie in session.cookies:
+        driver.add_cookie({
+            "name": cookie.name,
+            "value": cookie.value,
+            "path": cookie.path or "/",
+            "secure": bool(cookie.secure),
+            "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+        })
+    driver.execute_script("window.localStorage.setItem('storedUsername', arguments[0]);", USERNAME)
+
+    yield driver
+
+    # иначе каждый тест оставлял бы на BMC открытую сессию и упирался в их лимит
+    webui_logout(session)
+    driver.delete_all_cookies()
+    driver.execute_script("window.localStorage.clear();")
@@ -0,0 +1,145 @@
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from common.config import BMC_URL
+from waits import network_idle, network_state, url_left
+
+TIMEOUT = 30
+POLL_FREQUENCY = 0.1
+
+LOCKOUT_MESSAGES = ["Account locked", "Account blocked", "Too many attempts", "locked", "blocked"]
+ERROR_MESSAGES = ["Invalid username or password", "Account locked", "Account blocked", "Too many attempts",
+                  "Try again later"]
+
+
+class BasePage:
+    """Страница с кэшем найденных элементов: повторный поиск только если элемент устарел."""
+
+    URL = ""
+    NAME = None
+    LOCATORS = {}
+
+    def __init__(self, driver, base_url=BMC_URL, timeout=TIMEOUT):
+        self.driver = driver
+        self.base_url = base_url
+        self.timeout = timeout
+        self._elements = {}
+
+    def wait(self, timeout=None):
+        return WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=POLL_FREQUENCY)
+
+    def open(self):
+        self.driver.get(f"{self.base_url}{self.URL}")
+        self._elements.clear()
+        self.wait().until(network_idle())
+        self.record_metrics(self.NAME)
+        return self
+
+    def record_metrics(self, name):
+        # регистратор метрик вешает на драйвер фикстура driver (conftest.py)
+        recorder = getattr(self.driver, "perf_recorder", None)
+        if recorder is not None and name:
+            recorder.capture(name)
+
+    def element(self, name):
+        element = self._elements.get(name)
+        if element is not None:
+            try:
+                element.is_enabled()
+                return element
+            except StaleElementReferenceException:
+                pass
+        element = self.wait().until(EC.presence_of_element_located(self.LOCATORS[name]))
+        self._elements[name] = element
+        return element
+
+    def find_text(self, messages):
+        for message in messages:
+            elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{message}')]")
+            if elements:
+                return elements[0].text
+        return None
+
+    def screenshot(self, name):
+        self.driver.save_screenshot(name)
+        print(f"Скриншот сохранен: {name}")
+
+
+class LoginResult:
+
+    def __init__(self, page, logged_in):
+        self.page = page
+        self.logged_in = logged_in
+        self.url = page.driver.current_url
+        self.message = page.find_text(ERROR_MESSAGES) if not logged_in else None
+
+    @property
+    def locked(self):
+        return LockoutBanner(self.page.driver).is_displayed()
+
+
+class LoginPage(BasePage):
+
+    URL = ""
+    NAME = "login"
+    LOCATORS = {
+        "username": (By.CSS_SELECTOR, "input#username, input[type='text']"),
+        "password": (By.CSS_SELECTOR, "input#password, input[type='password']"),
+        "submit": (By.XPATH, "//button[contains(., 'Log in')]"),
+    }
+
+    def open(self):
+        super().open()
+        # уже авторизованный браузер приложение сразу уводит со страницы логина
+        self.wait().until(lambda driver: url_left("login")(driver) or driver.find_elements(*self.LOCATORS["username"]))
+        return self
+
+    def login(self, username, password):
+        if url_left("login")(self.driver) and not self.driver.find_elements(*self.LOCATORS["username"]):
+            return LoginResult(self, True)
+        _, _, completed = network_state(self.driver)
+        username_field = self.element("username")
+        password_field = self.element("password")
+        username_field.clear()
+        password_field.clear()
+        username_field.send_keys(username)
+        password_field.send_keys(password)
+        self.element("submit").click()
+
+        # успех - уход со страницы логина; неудача - ответ на запрос входа и затишье в сети
+        left_login = url_left("login")
+        login_answered = network_idle(since=completed)
+        try:
+            self.wait().until(lambda driver: left_login(driver) or login_answered(driver))
+        except TimeoutException:
+            pass
+        logged_in = left_login(self.driver)
+        if logged_in:
+            self.wait().until(network_idle())
+            self.record_metrics("overview")
+        return LoginResult(self, logged_in)
+
+
+class LockoutBanner:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def text(self):
+        return BasePage(self.driver).find_text(LOCKOUT_MESSAGES)
+
+    def is_displayed(self):
+        return self.text() is not None
+
+
+class ThermalPage(BasePage):
+
+    URL = "/redfish/v1/Chassis/chassis/Thermal"
+    NAME = "thermal"
+    LOCATORS = {"body": (By.TAG_NAME, "body")}
+
+    def text(self):
+        self.wait().until(lambda driver: self.element("body").text.strip())
+        return self.element("body").text
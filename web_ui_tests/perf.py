@@ -0,0 +1,125 @@
+import json
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+# Ставится в каждый новый документ до скриптов страницы: long tasks видны только через PerformanceObserver
+INIT_SCRIPT = """
+window.__longTasks = [];
+try {
+    new PerformanceObserver(list => {
+        for (const entry of list.getEntries()) window.__longTasks.push(entry.duration);
+    }).observe({type: 'longtask', buffered: true});
+} catch (e) {}
+performance.setResourceTimingBufferSize(1000);
+"""
+
+COLLECT_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource').map(r => [r.name, r.initiatorType, r.duration, r.transferSize]);
+const longTasks = (window.__longTasks || []).splice(0);
+performance.clearResourceTimings();
+return {
+    timeOrigin: performance.timeOrigin,
+    url: location.href,
+    navigation: nav ? {
+        ttfb: nav.responseStart,
+        domContentLoaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd,
+        transferSize: nav.transferSize
+    } : null,
+    resources: resources,
+    longTasks: longTasks
+};
+"""
+
+# метрики, которые сравниваются с базовой линией; больше - хуже
+BASELINE_METRICS = ["load_ms", "resources", "transfer_bytes", "redfish_xhr", "long_task_ms", "js_heap_used"]
+
+
+class PageMetricsRecorder:
+    """Снимает Navigation/Resource Timing, long tasks, размер JS heap и число XHR к /redfish/v1 через CDP."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = []
+        self.enabled = True
+        self._time_origin = None
+        try:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INIT_SCRIPT})
+        except (AttributeError, WebDriverException) as e:
+            print(f"Метрики производительности недоступны: {e}")
+            self.enabled = False
+
+    def heap(self):
+        metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        values = {metric["name"]: metric["value"] for metric in metrics}
+        return values.get("JSHeapUsedSize", 0), values.get("JSHeapTotalSize", 0)
+
+    def capture(self, page):
+        """Метрики страницы page с момента предыдущего снимка; Navigation Timing - только после полной загрузки."""
+        if not self.enabled:
+            return None
+        try:
+            data = self.driver.execute_script(COLLECT_SCRIPT)
+            heap_used, heap_total = self.heap()
+        except WebDriverException as e:
+            print(f"Не удалось снять метрики страницы {page}: {e}")
+            return None
+
+        navigation = data["navigation"] if data["timeOrigin"] != self._time_origin else None
+        self._time_origin = data["timeOrigin"]
+        resources = data["resources"]
+        metrics = {
+            "page": page,
+            "url": data["url"],
+            "load_ms": navigation["load"] if navigation else None,
+            "dom_content_loaded_ms": navigation["domContentLoaded"] if navigation else None,
+            "ttfb_ms": navigation["ttfb"] if navigation else None,
+            "resources": len(resources),
+            "transfer_bytes": sum(r[3] or 0 for r in resources) + (navigation["transferSize"] if navigation else 0),
+            "slowest_resource_ms": max((r[2] for r in resources), default=0),
+            "redfish_xhr": sum(1 for r in resources if r[1] in ("xmlhttprequest", "fetch") and "/redfish/v1" in r[0]),
+            "long_tasks": len(data["longTasks"]),
+            "long_task_ms": sum(data["longTasks"]),
+            "js_heap_used": heap_used,
+            "js_heap_total": heap_total,
+        }
+        self.pages.append(metrics)
+        return metrics
+
+
+def load_baseline(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def page_summary(pages):
+    """Средние значения метрик по каждой странице."""
+    grouped = {}
+    for metrics in pages:
+        grouped.setdefault(metrics["page"], []).append(metrics)
+    summary = {}
+    for page, entries in grouped.items():
+        summary[page] = {"visits": len(entries)}
+        for metric in BASELINE_METRICS + ["dom_content_loaded_ms", "ttfb_ms", "long_tasks", "slowest_resource_ms"]:
+            values = [entry[metric] for entry in entries if entry.get(metric) is not None]
+            summary[page][metric] = sum(values) / len(values) if values else None
+    return summary
+
+
+def compare(summary, baseline, tolerance=0.5):
+    """{page: {metric: (current, baseline, regressed)}} для метрик, у которых есть базовое значение."""
+    result = {}
+    for page, metrics in summary.items():
+        base = baseline.get(page, {})
+        result[page] = {}
+        for metric in BASELINE_METRICS:
+            current, expected = metrics.get(metric), base.get(metric)
+            if current is None or not expected:
+                continue
+            result[page][metric] = (current, expected, current > expected * (1 + tolerance))
+    return result
@@ -0,0 +1,109 @@
+import glob
+import html
+import json
+import os
+
+import pytest
+
+from perf import BASELINE_METRICS, compare, load_baseline, page_summary
+
+PAGES = []
+SUMMARY = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("webui-perf")
+    group.addoption("--perf-json", default="webui_perf.json",
+                    help="куда сохранить метрики загрузки страниц web UI")
+    group.addoption("--perf-baseline", default=os.path.join(os.path.dirname(__file__), "perf_baseline.json"),
+                    help="базовые значения метрик по страницам")
+    group.addoption("--perf-update-baseline", action="store_true", default=False,
+                    help="записать текущие метрики как новую базовую линию")
+    group.addoption("--perf-tolerance", type=float, default=0.5,
+                    help="допустимый рост метрики относительно базовой линии (0.5 = +50%%)")
+
+
+def worker_id():
+    return os.environ.get("PYTEST_XDIST_WORKER")
+
+
+def pytest_sessionfinish(session):
+    global SUMMARY
+
+    path = session.config.getoption("--perf-json")
+    if not path:
+        return
+    if worker_id():
+        # процесс xdist сохраняет свою часть, объединяет главный процесс
+        with open(f"{path}.{worker_id()}", "w") as f:
+            json.dump(PAGES, f)
+        return
+
+    pages = list(PAGES)
+    for part in glob.glob(f"{path}.gw*"):
+        with open(part) as f:
+            pages.extend(json.load(f))
+        os.remove(part)
+    if not pages:
+        return
+
+    SUMMARY = page_summary(pages)
+    baseline_path = session.config.getoption("--perf-baseline")
+    baseline = load_baseline(baseline_path)
+    comparison = compare(SUMMARY, baseline, session.config.getoption("--perf-tolerance"))
+    with open(path, "w") as f:
+        json.dump({"pages": pages, "summary": SUMMARY, "baseline": baseline,
+                   "regressions": {page: [m for m, (_, _, bad) in metrics.items() if bad]
+                                   for page, metrics in comparison.items()}}, f, indent=2)
+    if session.config.getoption("--perf-update-baseline"):
+        with open(baseline_path, "w") as f:
+            json.dump({page: {m: metrics[m] for m in BASELINE_METRICS} for page, metrics in SUMMARY.items()},
+                      f, indent=2)
+        print(f"Базовая линия метрик обновлена: {baseline_path}")
+
+
+def format_value(metric, value):
+    if value is None:
+        return "-"
+    if metric.startswith("js_heap") or metric.endswith("bytes"):
+        return f"{value / 1024:.0f} KiB"
+    if metric.endswith("_ms"):
+        return f"{value:.0f} мс"
+    return f"{value:.1f}"
+
+
+def render_html(summary, comparison):
+    header = "".join(f"<th>{metric}</th>" for metric in BASELINE_METRICS)
+    rows = []
+    for page, metrics in summary.items():
+        cells = []
+        for metric in BASELINE_METRICS:
+            cell = format_value(metric, metrics.get(metric))
+            if metric in comparison.get(page, {}):
+                _, expected, regressed = comparison[page][metric]
+                cell += f" (база {format_value(metric, expected)})"
+                if regressed:
+                    cell = f"<b style='color:red'>{cell}</b>"
+            cells.append(f"<td>{cell}</td>")
+        rows.append(f"<tr><td>{html.escape(page)}</td><td>{metrics['visits']}</td>{''.join(cells)}</tr>")
+    return (f"<h3>Производительность страниц web UI</h3><table><tr><th>Страница</th><th>Визитов</th>{header}</tr>"
+            + "".join(rows) + "</table>")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    if SUMMARY:
+        baseline = load_baseline(session.config.getoption("--perf-baseline"))
+        postfix.append(render_html(SUMMARY, compare(SUMMARY, baseline, session.config.getoption("--perf-tolerance"))))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not SUMMARY:
+        return
+    comparison = compare(SUMMARY, load_baseline(config.getoption("--perf-baseline")), config.getoption("--perf-tolerance"))
+    terminalreporter.section("Производительность страниц web UI")
+    for page, metrics in SUMMARY.items():
+        values = ", ".join(f"{metric}={format_value(metric, metrics.get(metric))}" for metric in BASELINE_METRICS)
+        regressions = [metric for metric, (_, _, bad) in comparison.get(page, {}).items() if bad]
+        suffix = f"  РЕГРЕССИЯ: {', '.join(regressions)}" if regressions else ""
+        terminalreporter.write_line(f"{page}: {values}{suffix}")
@@ -0,0 +1,66 @@
+import time
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+# Счетчик XHR/fetch в странице: pending - незавершенные запросы, completed - завершенные с момента установки
+NETWORK_TRACKER = """
+if (!window.__netTracker) {
+    const tracker = window.__netTracker = {pending: 0, completed: 0};
+    const done = () => { tracker.pending--; tracker.completed++; };
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        tracker.pending++;
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            tracker.pending++;
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+}
+return [document.readyState, window.__netTracker.pending, window.__netTracker.completed];
+"""
+
+
+def network_state(driver):
+    try:
+        state, pending, completed = driver.execute_script(NETWORK_TRACKER)
+    except (JavascriptException, WebDriverException):
+        return "loading", 1, 0
+    return state, pending, completed
+
+
+class network_idle:
+    """Условие WebDriverWait: документ загружен и quiet секунд нет новых и незавершенных XHR/fetch."""
+
+    def __init__(self, quiet=0.3, since=None):
+        self.quiet = quiet
+        self.since = since
+        self._last = None
+        self._changed_at = None
+
+    def __call__(self, driver):
+        state, pending, completed = network_state(driver)
+        now = time.monotonic()
+        if (pending, completed) != self._last:
+            self._last = (pending, completed)
+            self._changed_at = now
+        if state != "complete" or pending:
+            return False
+        # ждем хотя бы один завершенный запрос после действия (например, после нажатия Log in)
+        if self.since is not None and completed <= self.since:
+            return False
+        return now - self._changed_at >= self.quiet
+
+
+class url_left:
+    """Условие: URL больше не содержит fragment (например, ушли со страницы логина)."""
+
+    def __init__(self, fragment):
+        self.fragment = fragment
+
+    def __call__(self, driver):
+        return self.fragment not in driver.current_url.lower()